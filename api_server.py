@@ -4,6 +4,10 @@ Flask API Server for HDRezka using HdRezkaApi library
 Provides search and video source extraction with proper quality handling
 """
 
+import threading
+import time
+from collections import OrderedDict
+
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 from HdRezkaApi import HdRezkaApi
@@ -13,6 +17,13 @@ except ImportError:
     # Fallback for older versions
     HdRezkaSearch = None
 
+# Fastest installed BeautifulSoup tree builder
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
@@ -26,6 +37,56 @@ def after_request(response):
 
 BASE_URL = "https://rezka.ag"
 
+# Lowercase letters that look the same in Latin and Cyrillic
+HOMOGLYPHS_LATIN = "aeopcyxkmthbi"
+HOMOGLYPHS_CYRILLIC = "аеорсухкмтнві"
+TO_CYRILLIC = str.maketrans(HOMOGLYPHS_LATIN, HOMOGLYPHS_CYRILLIC)
+TO_LATIN = str.maketrans(HOMOGLYPHS_CYRILLIC, HOMOGLYPHS_LATIN)
+
+
+def normalize_query(query):
+    """Case-folded, single-spaced query; words mixing Latin and Cyrillic lookalikes are folded into their main script"""
+    words = []
+    for word in query.casefold().split():
+        cyrillic = sum(1 for ch in word if 'а' <= ch <= 'я' or ch in 'ёіїєў')
+        latin = sum(1 for ch in word if 'a' <= ch <= 'z')
+        if cyrillic and latin:
+            word = word.translate(TO_CYRILLIC if cyrillic >= latin else TO_LATIN)
+        words.append(word)
+    return ' '.join(words)
+
+
+class SearchCache:
+    """LRU + TTL cache of formatted search results by (source, normalized query)"""
+
+    def __init__(self, ttl=300, maxsize=2048):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self.data[key]
+                return None
+            self.data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = (time.monotonic() + self.ttl, value)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+
+# search.php results and /search/ page scrapes are cached separately
+search_cache = SearchCache()
+
 
 @app.route('/api/search', methods=['GET'])
 def search():
@@ -37,12 +98,18 @@ def search():
 
     try:
         print(f"[SEARCH] Query: {query}")
+        normalized = normalize_query(query)
+        for source in ('fast', 'page'):
+            cached = search_cache.get((source, normalized))
+            if cached is not None:
+                print(f"[SEARCH] {len(cached)} {source} results from cache")
+                return jsonify({'query': query, 'count': len(cached), 'results': cached})
 
         # Try using HdRezkaSearch if available
         if HdRezkaSearch:
             try:
                 search_api = HdRezkaSearch(BASE_URL)
-                results_raw = search_api(query)
+                results_raw = search_api(normalized)
 
                 # Transform results to match our frontend format
                 results = []
@@ -67,6 +134,8 @@ def search():
                         continue
 
                 print(f"[SEARCH] Found {len(results)} results")
+                if results:  # an empty or failed lookup is retried instead of cached for the TTL
+                    search_cache.set(('fast', normalized), results)
                 return jsonify({
                     'query': query,
                     'count': len(results),
@@ -80,13 +149,13 @@ def search():
         from bs4 import BeautifulSoup
         from urllib.parse import quote
 
-        search_url = f"{BASE_URL}/search/?do=search&subaction=search&q={quote(query)}"
+        search_url = f"{BASE_URL}/search/?do=search&subaction=search&q={quote(normalized)}"
         print(f"[SEARCH FALLBACK] {search_url}")
 
         response = requests.get(search_url, headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.text, HTML_PARSER)
 
         results = []
         items = soup.select('.b-content__inline_item')
@@ -126,6 +195,8 @@ def search():
                 continue
 
         print(f"[SEARCH] Found {len(results)} results")
+        if results:  # an empty or failed lookup is retried instead of cached for the TTL
+            search_cache.set(('page', normalized), results)
         return jsonify({
             'query': query,
             'count': len(results),
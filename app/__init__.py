@@ -31,4 +31,43 @@ def create_app(config_name='default'):
     app.register_blueprint(video_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
 
+    # Upstream rate limit shared by every request of the library's pooled transport
+    from HdRezkaApi.ratelimit import default_limiter
+    from HdRezkaApi.transport import default_transport
+    if app.config['UPSTREAM_RATE']:
+        default_limiter().bucket_options.update(
+            rate=app.config['UPSTREAM_RATE'], max_rate=max(app.config['UPSTREAM_RATE'], app.config['UPSTREAM_MAX_RATE']))
+        default_limiter().max_wait = app.config['UPSTREAM_MAX_WAIT']
+    else:
+        default_transport().rate_limit = None
+
+    # Last-resort egress for get_cdn_series: a real browser (direct and the worker come first)
+    if app.config['BROWSER_FALLBACK']:
+        try:
+            from HdRezkaApi.egress import CallableRoute, default_egress
+            from app.utils import BrowserPool, PlaywrightStreamFetcher, browser_cdn_series
+            PlaywrightStreamFetcher.pool = BrowserPool(
+                browsers=app.config['BROWSER_POOL_SIZE'], max_pages=app.config['BROWSER_MAX_PAGES']).warm()
+            default_egress().register(CallableRoute('browser', browser_cdn_series, cost=2))
+            print("[INIT] Browser egress route registered")
+        except ImportError as e:
+            print(f"[INIT] Browser egress route unavailable: {e}")
+
+    # Home page is served from a background-refreshed snapshot
+    from app.feed import FeedSnapshot
+    feed = FeedSnapshot(
+        app.config['BASE_URL'], interval=app.config['FEED_REFRESH_SECONDS'],
+        path=app.config['FEED_SNAPSHOT_PATH'])
+    if app.config['TESTING']:
+        feed.load()  # tests only see a stored snapshot; nothing scrapes in the background
+    else:
+        feed.start()
+    app.extensions['feed'] = feed
+
+    # Background prefetch of the next episodes, checked first by /api/stream
+    if app.config['PREFETCH_EPISODES']:
+        from app.prefetch import PrefetchScheduler
+        app.extensions['prefetcher'] = PrefetchScheduler(
+            depth=app.config['PREFETCH_EPISODES'], rate=app.config['PREFETCH_RATE'])
+
     return app
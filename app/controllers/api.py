@@ -7,14 +7,14 @@ import os
 # Add local lib to path FIRST before any HdRezkaApi imports
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'lib'))
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from app.models import Episode, Quality
-import requests
 
 # Now import HdRezkaApi from local lib
 import HdRezkaApi
 from HdRezkaApi import HdRezkaApi as HdRezkaApiClass
-from HdRezkaApi import TVSeries, Movie, FetchFailed
+from HdRezkaApi import TVSeries, Movie, FetchFailed, RateLimited
+from HdRezkaApi.transport import default_transport
 
 print(f"[INIT] Using custom HdRezkaApi v{HdRezkaApi.__version__} library from lib/HdRezkaApi")
 
@@ -26,28 +26,26 @@ if cloudflare_url:
 else:
     print(f"[INIT] ⚠️  Cloudflare Worker NOT configured (env var CLOUDFLARE_WORKER_URL not set)")
 
-# Monkey-patch requests to log what's being sent
-original_post = requests.post
-
-def logged_post(url, *args, **kwargs):
-    print(f"[HTTP] POST {url}")
-    if 'headers' in kwargs:
-        print(f"[HTTP] Headers: {kwargs['headers']}")
-    if 'data' in kwargs:
-        print(f"[HTTP] Data: {kwargs['data']}")
-    response = original_post(url, *args, **kwargs)
+# Log every POST sent through the library's pooled transport
+def logged_post(response, *args, **kwargs):
+    sent = response.request
+    if sent.method != 'POST':
+        return response
+    print(f"[HTTP] POST {sent.url}")
+    print(f"[HTTP] Headers: {dict(sent.headers)}")
+    if sent.body:
+        print(f"[HTTP] Data: {sent.body}")
     print(f"[HTTP] Response status: {response.status_code}")
-    if hasattr(response, 'json'):
-        try:
-            json_resp = response.json()
-            print(f"[HTTP] Response JSON keys: {list(json_resp.keys()) if isinstance(json_resp, dict) else 'not a dict'}")
-            if isinstance(json_resp, dict) and 'url' in json_resp:
-                print(f"[HTTP] Response['url'] type: {type(json_resp['url'])}, value: {json_resp['url']}")
-        except:
-            pass
+    try:
+        json_resp = response.json()
+        print(f"[HTTP] Response JSON keys: {list(json_resp.keys()) if isinstance(json_resp, dict) else 'not a dict'}")
+        if isinstance(json_resp, dict) and 'url' in json_resp:
+            print(f"[HTTP] Response['url'] type: {type(json_resp['url'])}, value: {json_resp['url']}")
+    except:
+        pass
     return response
 
-requests.post = logged_post
+default_transport().session.hooks['response'].append(logged_post)
 
 api_bp = Blueprint('api', __name__)
 
@@ -225,6 +223,51 @@ def get_season_episodes():
         return jsonify({'error': str(e)}), 500
 
 
+def stream_response(stream):
+    """JSON response for /api/stream from a resolved HdRezkaStream"""
+    # Serialized stream: videos is {quality: [urls]} sorted from lowest to highest quality
+    stream_data = stream.to_dict()
+
+    # Get all available quality options
+    quality_options = [
+        {'quality': quality, 'url': urls[0]}  # Take first URL
+        for quality, urls in stream_data['videos'].items() if urls
+    ]
+
+    if quality_options:
+        print(f"[SUCCESS] Found {len(quality_options)} quality options")
+
+        # Extract subtitle information
+        subtitles = [
+            {'code': code, 'label': sub_info['title'], 'url': sub_info['link']}
+            for code, sub_info in stream_data['subtitles'].items()
+        ]
+        if subtitles:
+            print(f"[SUCCESS] Found {len(subtitles)} subtitle tracks")
+
+        # Format the response
+        quality_field = ','.join([
+            f"[{opt['quality']}]{opt['url']}"
+            for opt in quality_options
+        ])
+
+        return jsonify({
+            'success': True,
+            'url': quality_field,
+            'quality': quality_field,
+            'qualities': quality_options,
+            'subtitles': subtitles,
+            'subtitle': '',
+            'subtitle_lns': '',
+            'thumbnails': ''
+        })
+    else:
+        return jsonify({
+            'success': False,
+            'error': 'No quality options found'
+        }), 500
+
+
 @api_bp.route('/stream', methods=['POST'])
 def get_stream_url():
     """Get stream URLs with all quality options"""
@@ -241,6 +284,14 @@ def get_stream_url():
         print(f"[STREAM] Getting stream for: {video_url}")
         print(f"  Translator: {translator_id}, Season: {season_id}, Episode: {episode_id}")
 
+        # Episodes resolved ahead of time by the prefetch scheduler skip upstream entirely
+        prefetcher = current_app.extensions.get('prefetcher')
+        if prefetcher and all(value and value != 'null' for value in (translator_id, season_id, episode_id)):
+            stream = prefetcher.lookup(video_url, translator_id, season_id, episode_id)
+            if stream:
+                print(f"[STREAM] Served from the prefetch store")
+                return stream_response(stream)
+
         # Initialize HdRezkaApi with proper headers and cookies
         try:
             headers = get_headers(video_url)
@@ -258,8 +309,7 @@ def get_stream_url():
             rezka = HdRezkaApiClass(video_url, headers=headers, cookies=cookies)
 
             # Debug: Check if instance has Cloudflare Worker configured
-            print(f"[DEBUG] Instance cloudflare_worker_url: {rezka.cloudflare_worker_url}")
-            print(f"[DEBUG] Instance use_cloudflare_proxy: {rezka.use_cloudflare_proxy}")
+            print(f"[DEBUG] Egress routes: {rezka.egress.snapshot()}")
             print(f"[STREAM] Content type: {rezka.type}")
             print(f"[STREAM] Available translators: {list(rezka.translators.keys()) if hasattr(rezka, 'translators') else 'None'}")
         except Exception as e:
@@ -296,8 +346,19 @@ def get_stream_url():
                     stream = rezka.getStream(translation=int(translator_id))
                 else:
                     stream = rezka.getStream()
+        except RateLimited as e:
+            # Our own upstream limit is saturated; shed the request instead of holding the worker
+            print(f"[ERROR] {e}")
+            response = jsonify({
+                'success': False,
+                'error': 'Too many stream requests right now, please retry shortly'
+            })
+            response.headers['Retry-After'] = str(int(e.wait) + 1)
+            return response, 429
         except FetchFailed as e:
             # This is raised when API returns success: true but url: false
+            if prefetcher:
+                prefetcher.health.record(False)
             error_msg = str(e)
             print(f"[ERROR] FetchFailed: {error_msg}")
             print(f"[ERROR] This is likely IP-based blocking from datacenter/cloud hosting")
@@ -308,6 +369,8 @@ def get_stream_url():
                 'error': 'Unable to access video stream. The server is blocking requests from this IP address. See IP_BLOCKING_ISSUE.md for solutions.'
             }), 503
         except Exception as e:
+            if prefetcher:
+                prefetcher.health.record(False)
             print(f"[ERROR] Failed to get stream: {e}")
             import traceback
             traceback.print_exc()
@@ -321,54 +384,17 @@ def get_stream_url():
                 'success': False,
                 'error': 'Failed to get stream'
             }), 500
+        if prefetcher:
+            prefetcher.health.record(True)
 
-        # Get all available quality options
-        quality_options = []
-
-        # The stream.videos is a dict with quality as key
-        if hasattr(stream, 'videos') and stream.videos:
-            for quality, urls in stream.videos.items():
-                # urls is a list of URLs for this quality
-                if urls and len(urls) > 0:
-                    quality_options.append({
-                        'quality': quality,
-                        'url': urls[0]  # Take first URL
-                    })
-
-            print(f"[SUCCESS] Found {len(quality_options)} quality options")
-
-            # Extract subtitle information
-            subtitles = []
-            if hasattr(stream, 'subtitles') and hasattr(stream.subtitles, 'subtitles') and stream.subtitles.subtitles:
-                for code, sub_info in stream.subtitles.subtitles.items():
-                    subtitles.append({
-                        'code': code,
-                        'label': sub_info['title'],
-                        'url': sub_info['link']
-                    })
-                print(f"[SUCCESS] Found {len(subtitles)} subtitle tracks")
-
-            # Format the response
-            quality_field = ','.join([
-                f"[{opt['quality']}]{opt['url']}"
-                for opt in quality_options
-            ])
+        if rezka.type == TVSeries() and prefetcher:
+            try:
+                if prefetcher.schedule(rezka, stream.translator_id, season_num, episode_num):
+                    print(f"[PREFETCH] Queued upcoming episodes after S{season_num}E{episode_num}")
+            except Exception as e:
+                print(f"[PREFETCH] Not scheduled: {e}")
 
-            return jsonify({
-                'success': True,
-                'url': quality_field,
-                'quality': quality_field,
-                'qualities': quality_options,
-                'subtitles': subtitles,
-                'subtitle': '',
-                'subtitle_lns': '',
-                'thumbnails': ''
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'No quality options found'
-            }), 500
+        return stream_response(stream)
 
     except Exception as e:
         print(f"[ERROR] Getting stream: {e}")
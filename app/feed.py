@@ -0,0 +1,135 @@
+"""
+Home-page feed snapshot, refreshed in the background and served to /
+"""
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'lib'))
+
+from HdRezkaApi.parsers import make_soup
+from HdRezkaApi.transport import default_transport
+from app.models import SearchResult, extract_video_id
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+MIN_INTERVAL = 60  # seconds between scrapes at the least; 0 would scrape the home page in a tight loop
+
+
+def parse_home(markup, base_url, limit=24):
+    """SearchResult items of the "recently added" grid of the home page"""
+    soup = make_soup(markup)
+    results = []
+    for item in soup.select('.b-content__inline_item')[:limit]:
+        try:
+            link_elem = item.select_one('.b-content__inline_item-link a')
+            if not link_elem:
+                continue
+
+            url = link_elem.get('href')
+            # Convert relative URLs to absolute
+            if url and url.startswith('/'):
+                url = base_url + url
+
+            info_elem = item.select_one('.b-content__inline_item-link div')
+            cover_elem = item.select_one('.b-content__inline_item-cover img')
+
+            results.append(SearchResult(
+                id=extract_video_id(url),
+                title=link_elem.text.strip(),
+                url=url,
+                poster=cover_elem.get('src') if cover_elem else '',
+                year='',
+                country='',
+                genre='',
+                info=info_elem.text.strip() if info_elem else ''
+            ))
+        except Exception as e:
+            print(f"[ERROR] Parsing item: {e}")
+            continue
+    return results
+
+
+class FeedSnapshot:
+    """
+    Last successful scrape of the home page.
+
+    A daemon thread refreshes it every `interval` seconds; when `path` is set
+    the snapshot is also written there and loaded on startup, so a restarted
+    process serves / immediately. A failed refresh keeps the previous snapshot.
+    """
+
+    def __init__(self, base_url, interval=600, path=None, limit=24, timeout=10, first_wait=10):
+        self.base_url = base_url
+        self.interval = max(interval, MIN_INTERVAL)
+        self.path = path
+        self.limit = limit
+        self.timeout = timeout
+        self.first_wait = first_wait
+        self.results = None
+        self.updated = None
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.load()
+        self.thread = threading.Thread(target=self.run, name='feed-snapshot', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.refresh()
+            self.stopped.wait(self.interval)
+
+    def refresh(self):
+        try:
+            response = default_transport().get(self.base_url, headers=HEADERS, timeout=self.timeout)
+            response.raise_for_status()
+            results = parse_home(response.content, self.base_url, self.limit)
+            if not results:
+                raise ValueError('no items on the home page')
+        except Exception as e:
+            print(f"[FEED] Refresh failed, keeping the previous snapshot: {e}")
+            return False
+        self.results, self.updated = results, time.time()
+        self.ready.set()
+        self.save()
+        print(f"[FEED] Snapshot updated: {len(results)} items")
+        return True
+
+    def items(self):
+        """Current snapshot; only a cold start without a stored snapshot waits for the first scrape"""
+        if not self.ready.is_set() and self.thread is not None:
+            self.ready.wait(self.first_wait)
+        return list(self.results or [])
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.results = [SearchResult(**item) for item in data['results']]
+            self.updated = data['updated']
+            self.ready.set()
+            print(f"[FEED] Loaded snapshot from {self.path} ({len(self.results)} items)")
+        except Exception as e:
+            print(f"[FEED] Ignoring unreadable snapshot {self.path}: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'updated': self.updated, 'results': [asdict(r) for r in self.results]}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[FEED] Could not write snapshot {self.path}: {e}")
@@ -0,0 +1,212 @@
+"""
+Background prefetch of the next episodes after a successful /api/stream
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from queue import Queue, Empty
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'lib'))
+
+from HdRezkaApi import HdRezkaApi
+from HdRezkaApi.cache import default_stream_cache
+
+
+def post_id_from_url(video_url):
+    """Numeric post id of a title URL (".../79810-name.html" -> 79810), or None"""
+    post_id = (video_url or '').split('.html')[0].split('/')[-1].split('-')[0]
+    return int(post_id) if post_id.isnumeric() else None
+
+
+def next_episodes(episodes, season, episode, depth):
+    """The `depth` (season, episode) pairs after S`season`E`episode`, crossing into later seasons"""
+    ordered = [(s, e) for s in sorted(episodes) for e in sorted(episodes[s])]
+    if (season, episode) not in ordered:
+        return []
+    start = ordered.index((season, episode)) + 1
+    return ordered[start:start + depth]
+
+
+class UpstreamHealth:
+    """Recent upstream outcomes; unhealthy while the failure rate of the window is too high"""
+
+    def __init__(self, window=20, max_failure_rate=0.5, cooldown=60):
+        self.outcomes = deque(maxlen=window)
+        self.max_failure_rate = max_failure_rate
+        self.cooldown = cooldown
+        self.last_failure = None
+        self.lock = threading.Lock()
+
+    def record(self, ok):
+        with self.lock:
+            self.outcomes.append(bool(ok))
+            if not ok:
+                self.last_failure = time.monotonic()
+
+    @property
+    def healthy(self):
+        with self.lock:
+            if not self.outcomes or self.last_failure is None:
+                return True
+            if time.monotonic() - self.last_failure > self.cooldown:
+                return True
+            failures = self.outcomes.count(False)
+            return failures / len(self.outcomes) < self.max_failure_rate
+
+
+class PrefetchScheduler:
+    """
+    Speculatively resolves the next episodes of a series into the stream store.
+
+    Jobs run on a few daemon threads, at most `rate` upstream requests per
+    second in total. Scheduling a new episode of a title cancels the jobs
+    still pending for that title, and nothing is scheduled while upstream
+    is failing. Only (url, headers, cookies) of a title is remembered; every
+    job builds a fresh HdRezkaApi, which the shared title/episodes caches make cheap.
+    """
+
+    def __init__(self, depth=2, rate=1.0, workers=2, store=None, health=None):
+        self.depth = depth
+        self.interval = 1.0 / rate if rate else 0
+        self.store = store if store is not None else default_stream_cache
+        self.health = health or UpstreamHealth()
+        self.queue = Queue()
+        self.pending = {}  # post id -> generation; older jobs of the title are dropped
+        self.titles = OrderedDict()  # post id -> (url, headers, cookies) of the last scheduled request
+        self.max_titles = 256
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+        self.stopped = threading.Event()
+        self.stats = {'scheduled': 0, 'resolved': 0, 'failed': 0, 'cancelled': 0, 'skipped': 0}
+        self.threads = [threading.Thread(target=self.worker, name=f'prefetch-{i}', daemon=True) for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def lookup(self, video_url, translator_id, season, episode):
+        """
+        Prefetched (or otherwise cached) stream for an /api/stream request, without touching upstream.
+        A hit keeps the prefetch window moving for titles scheduled before; the planning is queued.
+        """
+        post_id = post_id_from_url(video_url)
+        if post_id is None or translator_id is None:
+            return None
+        stream = self.store.get((post_id, int(translator_id), int(season), int(episode)))
+        if stream is not None:
+            with self.lock:
+                title = self.titles.get(post_id)
+            if title is not None:
+                self.enqueue(post_id, title, int(translator_id), int(season), int(episode))
+        return stream
+
+    def schedule(self, rezka, translator_id, season, episode):
+        """Queue the planning of the episodes following S`season`E`episode` of `translator_id`"""
+        title = (rezka.url, dict(rezka.HEADERS), dict(rezka.cookies))
+        return self.enqueue(rezka.id, title, int(translator_id), int(season), int(episode))
+
+    def enqueue(self, post_id, title, translator_id, season, episode):
+        """Returns whether a plan job was queued; no upstream I/O happens on the caller's thread"""
+        if not self.depth or self.stopped.is_set():
+            return False
+        if not self.health.healthy:
+            self.count('skipped')
+            return False
+        with self.lock:
+            generation = self.pending.get(post_id, 0) + 1
+            self.pending[post_id] = generation
+            self.titles[post_id] = title
+            self.titles.move_to_end(post_id)
+            while len(self.titles) > self.max_titles:
+                self.pending.pop(self.titles.popitem(last=False)[0], None)
+        self.queue.put(('plan', post_id, translator_id, (season, episode), generation))
+        return True
+
+    def client(self, post_id):
+        """Fresh HdRezkaApi for a remembered title, or None once it was evicted"""
+        with self.lock:
+            title = self.titles.get(post_id)
+        if title is None:
+            return None
+        url, headers, cookies = title
+        return HdRezkaApi(url, headers=headers, cookies=cookies)
+
+    def cancel(self, post_id=None):
+        """Drop the pending jobs of one title, or of every title"""
+        with self.lock:
+            for key in ([post_id] if post_id is not None else list(self.pending)):
+                self.pending[key] = self.pending.get(key, 0) + 1
+
+    def stop(self):
+        self.cancel()
+        self.stopped.set()
+
+    def wait_slot(self):
+        """Block until the shared rate limit allows another upstream request"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.stats[name] += n
+
+    def current(self, post_id, generation):
+        with self.lock:
+            return self.pending.get(post_id) == generation
+
+    def worker(self):
+        while not self.stopped.is_set():
+            try:
+                kind, post_id, translator_id, (season, episode), generation = self.queue.get(timeout=1)
+            except Empty:
+                continue
+            try:
+                if not self.current(post_id, generation) or not self.health.healthy:
+                    self.count('cancelled')
+                    continue
+                rezka = self.client(post_id)
+                if rezka is None:
+                    self.count('cancelled')
+                    continue
+                if kind == 'plan':
+                    self.plan(rezka, post_id, translator_id, season, episode, generation)
+                else:
+                    self.fetch(rezka, post_id, translator_id, season, episode, generation)
+            except Exception as e:
+                self.health.record(False)
+                self.count('failed')
+                print(f"[PREFETCH] {kind} S{season}E{episode} of {post_id} failed: {e}")
+            finally:
+                self.queue.task_done()
+
+    def plan(self, rezka, post_id, translator_id, season, episode, generation):
+        """Queue the next `depth` episodes that are not in the store yet"""
+        if rezka.episodes_cache is None or rezka.episodes_cache.get((post_id, translator_id)) is None:
+            self.wait_slot()
+        entry = rezka.translatorEpisodes(translator_id)
+        if not entry:
+            return
+        targets = [
+            (s, e) for s, e in next_episodes(entry['episodes'], season, episode, self.depth)
+            if self.store.get((post_id, translator_id, s, e)) is None
+        ]
+        for target in targets:
+            self.queue.put(('fetch', post_id, translator_id, target, generation))
+        self.count('scheduled', len(targets))
+
+    def fetch(self, rezka, post_id, translator_id, season, episode, generation):
+        if self.store.get((post_id, translator_id, season, episode)) is not None:
+            return
+        self.wait_slot()
+        if not self.current(post_id, generation):
+            self.count('cancelled')
+            return
+        stream = rezka.getStream(season, episode, translator_id)
+        self.store.set((post_id, translator_id, season, episode), stream)
+        self.health.record(True)
+        self.count('resolved')
+        print(f"[PREFETCH] S{season}E{episode} of {post_id} ready")
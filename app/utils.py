@@ -1,9 +1,215 @@
 """
 Utility functions for bypassing API blocking
 """
+import asyncio
 import os
+import sys
 import json
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+
+# Add local lib to path FIRST before any HdRezkaApi imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'lib'))
+
+from HdRezkaApi.decoder import clear_trash
+
+LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled'
+]
+
+CONTEXT_OPTIONS = {
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'viewport': {'width': 1920, 'height': 1080},
+    'locale': 'en-US'
+}
+
+
+class BrowserSlot:
+    """One warm Chromium process and the context its new pages open in"""
+
+    def __init__(self):
+        self.browser = None
+        self.context = None
+        self.context_uses = 0
+        self.pages = 0  # open right now
+        self.uses = 0
+        self.started = 0.0
+
+    def worn_out(self, browser_uses, max_age):
+        return self.uses >= browser_uses or time.monotonic() - self.started >= max_age
+
+
+class BrowserPool:
+    """
+    Long-lived headless Chromium processes for PlaywrightStreamFetcher.
+
+    Playwright runs on one daemon thread with its own event loop and callers
+    block on run(). `browsers` processes stay warm and at most `max_pages`
+    pages are open at once. Each context is replaced after `context_uses`
+    pages and each browser is relaunched after `browser_uses` pages or
+    `max_age` seconds, once its open pages are done, to contain memory leaks.
+    """
+
+    def __init__(self, browsers=1, max_pages=2, context_uses=20, browser_uses=200, max_age=1800):
+        self.size = browsers
+        self.max_pages = max_pages
+        self.context_uses = context_uses
+        self.browser_uses = browser_uses
+        self.max_age = max_age
+        self.slots = [BrowserSlot() for _ in range(browsers)]
+        self.stats = {'pages': 0, 'launches': 0, 'recycled': 0, 'errors': 0}
+        self.playwright = None
+        self.loop = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self._pages = None  # asyncio objects are created on the pool's loop
+        self._changed = None
+        self._launching = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self.loop.run_forever, name='browser-pool', daemon=True)
+                self.thread.start()
+        return self
+
+    def warm(self):
+        """Launch every browser in the background so the first call only pays for a navigation"""
+        asyncio.run_coroutine_threadsafe(self._warm(), self.start().loop)
+        return self
+
+    def run(self, job, timeout=90):
+        """Result of `await job(page)` on a pooled page; the page is closed afterwards"""
+        future = asyncio.run_coroutine_threadsafe(self._run(job), self.start().loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise PlaywrightTimeout(f'Browser job did not finish within {timeout}s')
+
+    def close(self, timeout=30):
+        if self.thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close(), self.loop).result(timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+        self.thread = None
+
+    def _setup(self):
+        if self._pages is None:
+            self._pages = asyncio.Semaphore(self.max_pages)
+            self._changed = asyncio.Condition()
+            self._launching = asyncio.Lock()
+
+    async def _warm(self):
+        self._setup()
+        async with self._launching:
+            for slot in self.slots:
+                if slot.browser is None:
+                    try:
+                        await self._launch(slot)
+                    except Exception as e:
+                        print(f"[BROWSER POOL] Warm-up launch failed: {e}")
+
+    async def _run(self, job):
+        self._setup()
+        async with self._pages:
+            slot = await self._acquire()
+            context, page = None, None
+            try:
+                context, page = await self._open_page(slot)
+                return await job(page)
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+            finally:
+                await self._release(slot, context, page)
+
+    async def _acquire(self):
+        """Least busy slot that is not waiting to be recycled; launches browsers on demand"""
+        async with self._changed:
+            while True:
+                # a browser that wore out while idle has no _release left to recycle it
+                for slot in self.slots:
+                    if slot.browser and slot.pages == 0 and slot.worn_out(self.browser_uses, self.max_age):
+                        await self._recycle(slot)
+                ready = [s for s in self.slots if not s.browser or not s.worn_out(self.browser_uses, self.max_age)]
+                if ready:
+                    slot = min(ready, key=lambda s: s.pages)
+                    slot.pages += 1
+                    break
+                await self._changed.wait()
+        try:
+            async with self._launching:
+                if slot.browser is None or not slot.browser.is_connected():
+                    await self._launch(slot)
+        except Exception:
+            slot.pages -= 1
+            raise
+        return slot
+
+    async def _launch(self, slot):
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        slot.browser = await self.playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        slot.context, slot.context_uses = None, 0
+        slot.uses, slot.started = 0, time.monotonic()
+        self.stats['launches'] += 1
+        print(f"[BROWSER POOL] Launched browser {self.slots.index(slot) + 1}/{self.size}")
+
+    async def _open_page(self, slot):
+        if slot.context is None or slot.context_uses >= self.context_uses:
+            previous = slot.context
+            slot.context, slot.context_uses = await slot.browser.new_context(**CONTEXT_OPTIONS), 0
+            # pages still open keep the previous context alive; _release closes it after them
+            if previous is not None and not previous.pages:
+                await self._close_quietly(previous)
+        slot.context_uses += 1
+        context = slot.context
+        return context, await context.new_page()
+
+    async def _release(self, slot, context, page):
+        if page:
+            await self._close_quietly(page)
+        if context and context is not slot.context and not context.pages:
+            await self._close_quietly(context)  # replaced while this page was open
+        async with self._changed:
+            slot.pages -= 1
+            slot.uses += 1
+            self.stats['pages'] += 1
+            if slot.pages == 0 and slot.browser and slot.worn_out(self.browser_uses, self.max_age):
+                await self._recycle(slot)
+            self._changed.notify_all()
+
+    async def _recycle(self, slot):
+        """Close an idle worn-out browser; the next _acquire of the slot relaunches it"""
+        browser = slot.browser
+        slot.browser, slot.context = None, None
+        self.stats['recycled'] += 1
+        print(f"[BROWSER POOL] Recycling browser {self.slots.index(slot) + 1}/{self.size}")
+        await self._close_quietly(browser)
+
+    @staticmethod
+    async def _close_quietly(closable):
+        try:
+            await closable.close()
+        except Exception as e:
+            print(f"[BROWSER POOL] Close failed: {e}")
+
+    async def _close(self):
+        for slot in self.slots:
+            if slot.browser:
+                await self._close_quietly(slot.browser)
+                slot.browser, slot.context = None, None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
 
 
 class PlaywrightStreamFetcher:
@@ -12,8 +218,19 @@ class PlaywrightStreamFetcher:
     This uses a real browser to bypass bot detection.
     """
 
-    @staticmethod
-    def get_stream_with_browser(video_url, translator_id=None, season=None, episode=None):
+    # Warm browsers shared by every call; create_app may replace it with a configured pool
+    pool = None
+    pool_lock = threading.Lock()
+
+    @classmethod
+    def get_pool(cls):
+        with cls.pool_lock:
+            if cls.pool is None:
+                cls.pool = BrowserPool()
+            return cls.pool
+
+    @classmethod
+    def get_stream_with_browser(cls, video_url, translator_id=None, season=None, episode=None):
         """
         Fetch stream URL using Playwright browser automation
 
@@ -30,109 +247,11 @@ class PlaywrightStreamFetcher:
         print(f"  URL: {video_url}")
         print(f"  Translator: {translator_id}, Season: {season}, Episode: {episode}")
 
-        try:
-            with sync_playwright() as p:
-                # Launch browser in headless mode
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-blink-features=AutomationControlled'
-                    ]
-                )
-
-                context = browser.new_context(
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='en-US'
-                )
-
-                page = context.new_page()
-
-                # Navigate to video page
-                print(f"[PLAYWRIGHT] Navigating to {video_url}")
-                page.goto(video_url, wait_until='networkidle', timeout=30000)
-
-                # Wait for player to load
-                page.wait_for_selector('#player', timeout=10000)
-
-                # If translator is specified, select it
-                if translator_id:
-                    try:
-                        # Click translator dropdown
-                        page.click('.b-translator__item[data-translator_id="' + str(translator_id) + '"]', timeout=5000)
-                        page.wait_for_timeout(1000)
-                    except Exception as e:
-                        print(f"[PLAYWRIGHT] Could not select translator: {e}")
+        async def capture(page):
+            return await cls.capture_stream(page, video_url, translator_id, season, episode)
 
-                # If series, select season and episode
-                if season and episode:
-                    try:
-                        # Select season
-                        page.click(f'.b-simple_season__item[data-season_id="{season}"]', timeout=5000)
-                        page.wait_for_timeout(500)
-
-                        # Select episode
-                        page.click(f'.b-simple_episode__item[data-episode_id="{episode}"]', timeout=5000)
-                        page.wait_for_timeout(1000)
-                    except Exception as e:
-                        print(f"[PLAYWRIGHT] Could not select season/episode: {e}")
-
-                # Intercept network requests to capture stream data
-                stream_data = {'qualities': [], 'subtitles': []}
-
-                def handle_response(response):
-                    """Capture AJAX responses with stream URLs"""
-                    if 'ajax' in response.url and response.status == 200:
-                        try:
-                            data = response.json()
-                            if 'url' in data and data.get('success'):
-                                # Parse quality URLs
-                                url_str = data['url']
-                                if url_str and '[' in url_str:
-                                    # Format: [quality]url,[quality]url,...
-                                    for part in url_str.split(','):
-                                        if '[' in part and ']' in part:
-                                            quality = part[part.index('[')+1:part.index(']')]
-                                            url = part[part.index(']')+1:]
-                                            stream_data['qualities'].append({
-                                                'quality': quality,
-                                                'url': url
-                                            })
-
-                                # Get subtitles if present
-                                if 'subtitle' in data:
-                                    stream_data['subtitles_raw'] = data.get('subtitle', '')
-
-                        except Exception as e:
-                            print(f"[PLAYWRIGHT] Error parsing response: {e}")
-
-                page.on('response', handle_response)
-
-                # Click play button to trigger stream request
-                try:
-                    page.click('.b-player__btn', timeout=5000)
-                    page.wait_for_timeout(3000)  # Wait for AJAX request
-                except Exception as e:
-                    print(f"[PLAYWRIGHT] Could not click play: {e}")
-
-                browser.close()
-
-                if stream_data['qualities']:
-                    print(f"[PLAYWRIGHT] Successfully captured {len(stream_data['qualities'])} quality options")
-                    return {
-                        'success': True,
-                        'qualities': stream_data['qualities'],
-                        'subtitles': stream_data.get('subtitles', [])
-                    }
-                else:
-                    print(f"[PLAYWRIGHT] No stream data captured")
-                    return {
-                        'success': False,
-                        'error': 'Could not capture stream data from browser'
-                    }
+        try:
+            return cls.get_pool().run(capture)
 
         except PlaywrightTimeout as e:
             print(f"[PLAYWRIGHT] Timeout error: {e}")
@@ -148,3 +267,101 @@ class PlaywrightStreamFetcher:
                 'success': False,
                 'error': f'Browser automation failed: {str(e)}'
             }
+
+    @staticmethod
+    async def capture_stream(page, video_url, translator_id=None, season=None, episode=None):
+        """Drive a pooled page to the episode and capture the get_cdn_series reply"""
+        # Intercept network requests to capture stream data; registered before any click
+        # so the get_cdn_series call triggered by selecting the episode is seen too
+        stream_data = {'qualities': [], 'subtitles': []}
+
+        async def handle_response(response):
+            """Capture AJAX responses with stream URLs"""
+            if 'ajax' in response.url and response.status == 200:
+                try:
+                    data = await response.json()
+                    if 'url' in data and data.get('success'):
+                        stream_data['response'] = data
+                        # Parse quality URLs
+                        url_str = data['url']
+                        if url_str and url_str.startswith('#h'):
+                            url_str = clear_trash(url_str)
+                        if url_str and '[' in url_str:
+                            # Format: [quality]url,[quality]url,...
+                            for part in url_str.split(','):
+                                if '[' in part and ']' in part:
+                                    quality = part[part.index('[')+1:part.index(']')]
+                                    url = part[part.index(']')+1:]
+                                    stream_data['qualities'].append({
+                                        'quality': quality,
+                                        'url': url
+                                    })
+
+                        # Get subtitles if present
+                        if 'subtitle' in data:
+                            stream_data['subtitles_raw'] = data.get('subtitle', '')
+
+                except Exception as e:
+                    print(f"[PLAYWRIGHT] Error parsing response: {e}")
+
+        page.on('response', handle_response)
+
+        # Navigate to video page
+        print(f"[PLAYWRIGHT] Navigating to {video_url}")
+        await page.goto(video_url, wait_until='networkidle', timeout=30000)
+
+        # Wait for player to load
+        await page.wait_for_selector('#player', timeout=10000)
+
+        # If translator is specified, select it
+        if translator_id:
+            try:
+                # Click translator dropdown
+                await page.click('.b-translator__item[data-translator_id="' + str(translator_id) + '"]', timeout=5000)
+                await page.wait_for_timeout(1000)
+            except Exception as e:
+                print(f"[PLAYWRIGHT] Could not select translator: {e}")
+
+        # If series, select season and episode
+        if season and episode:
+            try:
+                # Select season
+                await page.click(f'.b-simple_season__item[data-season_id="{season}"]', timeout=5000)
+                await page.wait_for_timeout(500)
+
+                # Select episode
+                await page.click(f'.b-simple_episode__item[data-episode_id="{episode}"]', timeout=5000)
+                await page.wait_for_timeout(1000)
+            except Exception as e:
+                print(f"[PLAYWRIGHT] Could not select season/episode: {e}")
+
+        # Click play button to trigger stream request
+        try:
+            await page.click('.b-player__btn', timeout=5000)
+            await page.wait_for_timeout(3000)  # Wait for AJAX request
+        except Exception as e:
+            print(f"[PLAYWRIGHT] Could not click play: {e}")
+
+        if stream_data['qualities']:
+            print(f"[PLAYWRIGHT] Successfully captured {len(stream_data['qualities'])} quality options")
+            return {
+                'success': True,
+                'qualities': stream_data['qualities'],
+                'subtitles': stream_data.get('subtitles', []),
+                'response': stream_data.get('response')
+            }
+        else:
+            print(f"[PLAYWRIGHT] No stream data captured")
+            return {
+                'success': False,
+                'error': 'Could not capture stream data from browser'
+            }
+
+
+def browser_cdn_series(rezka, data, timeout=None):
+    """get_cdn_series response captured by a headless browser; backs the 'browser' egress route"""
+    result = PlaywrightStreamFetcher.get_stream_with_browser(
+        rezka.url, data.get('translator_id'), data.get('season'), data.get('episode'))
+    if not result.get('success') or not result.get('response'):
+        raise RuntimeError(result.get('error') or 'No get_cdn_series response captured by the browser')
+    return result['response']
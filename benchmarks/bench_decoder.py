@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: precomputed trash-token decoder vs the original clearTrash
+"""
+import base64
+import os
+import sys
+import timeit
+from itertools import product
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lib'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from HdRezkaApi.decoder import clear_trash
+from synthetic import stream_payload
+
+
+def legacy_clear_trash(data):
+    """clearTrash as it was before the decoder module (tokens rebuilt on every call)"""
+    trashList = ["@", "#", "!", "^", "$"]
+    trashCodesSet = []
+    for i in range(2, 4):
+        startchar = ''
+        for chars in product(trashList, repeat=i):
+            data_bytes = startchar.join(chars).encode("utf-8")
+            trashcombo = base64.b64encode(data_bytes)
+            trashCodesSet.append(trashcombo)
+
+    arr = data.replace("#h", "").split("//_//")
+    trashString = ''.join(arr)
+
+    for i in trashCodesSet:
+        temp = i.decode("utf-8")
+        trashString = trashString.replace(temp, '')
+
+    finalString = base64.b64decode(trashString + "==")
+    return finalString.decode("utf-8")
+
+
+def bench(name, func, payload, number):
+    seconds = min(timeit.repeat(lambda: func(payload), number=number, repeat=5)) / number
+    print(f"  {name:<20} {seconds * 1e6:10.1f} us/call")
+    return seconds
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cases = {
+        'movie (5 qualities)': ["360p", "480p", "720p", "1080p", "1080p Ultra"],
+        'series (3 qualities)': ["360p", "480p", "720p"],
+    }
+
+    print("=" * 60)
+    print("clearTrash decoder benchmark")
+    print("=" * 60)
+    for label, qualities in cases.items():
+        plain, payload = stream_payload(qualities)
+        assert legacy_clear_trash(payload) == plain
+        assert clear_trash(payload) == plain
+        print(f"\n{label}: {len(payload)} bytes")
+        old = bench('legacy clearTrash', legacy_clear_trash, payload, number)
+        new = bench('clear_trash', clear_trash, payload, number)
+        print(f"  speedup              {old / new:10.1f}x")
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency benchmark for the Flask endpoints against a replaying stand-in for rezka.ag
+
+Usage:
+    python benchmarks/bench_endpoints.py [--store STORE_DIR] [--users 8] [--requests 200]
+                                         [--latency 0.05] [--save-baseline] [--tolerance 0.25]
+
+Each endpoint is driven by --users concurrent clients for --requests requests,
+twice: "cold" right after the process-wide caches are cleared, then "warm".
+The run reports p50/p95/p99 latency, requests/sec, upstream calls per request
+and RSS growth (peak RSS during the pass minus RSS before it) per pass, and
+exits with status 1 when a metric regresses past --tolerance compared to the
+stored baseline (benchmarks/baseline.json). The baseline records the run
+parameters; a run with different ones is not compared (exit status 2).
+Without --store a synthetic corpus is generated into a temporary directory.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT, 'lib'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from HdRezkaApi.cache import (default_episodes_cache, default_search_cache, default_search_pages_cache,
+                              default_stream_cache, default_title_cache)
+from HdRezkaApi.replay import FixtureStore
+from standin import StandInServer
+import synthetic
+
+BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# metric -> (higher is better, absolute slack on top of the relative tolerance)
+METRICS = {'p50_ms': (False, 5.0), 'p95_ms': (False, 5.0), 'p99_ms': (False, 5.0), 'rps': (True, 0.0),
+           'upstream_per_request': (False, 0.05), 'rss_growth_mb': (False, 2.0)}
+
+CACHES = (default_title_cache, default_episodes_cache, default_search_cache, default_search_pages_cache,
+          default_stream_cache)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def rss_mb():
+    """Current RSS; falls back to the process high-water mark where /proc is missing"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+class RssSampler:
+    """Peak RSS growth over a block, sampled every `interval` seconds"""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.start = self.peak = 0.0
+        self.done = threading.Event()
+
+    def __enter__(self):
+        self.start = self.peak = rss_mb()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.done.set()
+        self.thread.join()
+        self.peak = max(self.peak, rss_mb())
+
+    def sample(self):
+        while not self.done.wait(self.interval):
+            self.peak = max(self.peak, rss_mb())
+
+    @property
+    def growth(self):
+        return self.peak - self.start
+
+
+def clear_caches(app):
+    """Start a cold pass: empty the process-wide caches and drain pending prefetch jobs"""
+    prefetcher = app.extensions.get('prefetcher')
+    if prefetcher:
+        prefetcher.cancel()
+        prefetcher.queue.join()
+    for cache in CACHES:
+        cache.clear()
+
+
+def scenarios(upstream, seasons, episodes, translators):
+    title_url = upstream + synthetic.TITLE_PATH
+
+    def stream_payload(rnd):
+        return {'video_url': title_url, 'translator_id': str(56 + rnd.randrange(translators)),
+                'season_id': str(rnd.randint(1, seasons)), 'episode_id': str(rnd.randint(1, episodes))}
+
+    return {
+        '/': lambda rnd: ('GET', '/', {}),
+        '/watch': lambda rnd: ('GET', '/watch', {'params': {'url': title_url, 'title': 'Test'}}),
+        '/search': lambda rnd: ('GET', '/search', {'params': {'q': 'test'}}),
+        '/api/episodes': lambda rnd: ('POST', '/api/episodes', {'json': {'video_url': title_url}}),
+        '/api/season_episodes': lambda rnd: ('POST', '/api/season_episodes', {
+            'json': {'video_url': title_url, 'season_id': str(rnd.randint(1, seasons))}}),
+        '/api/stream': lambda rnd: ('POST', '/api/stream', {'json': stream_payload(rnd)}),
+    }
+
+
+def drive(app_url, make_request, users, total, seed):
+    """Fire `total` requests from `users` concurrent clients; return per-request latencies"""
+    local = threading.local()
+    rnd = random.Random(seed)
+    plans = [make_request(rnd) for _ in range(total)]
+
+    def call(plan):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        method, path, kwargs = plan
+        start = time.perf_counter()
+        response = local.session.request(method, app_url + path, timeout=60, **kwargs)
+        elapsed = time.perf_counter() - start
+        if response.status_code >= 500:
+            raise RuntimeError(f"{method} {path} -> {response.status_code}: {response.text[:200]}")
+        return elapsed
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        return list(pool.map(call, plans))
+
+
+def run(store, users, total, latency, seasons, episodes, translators):
+    upstream = StandInServer(store, latency=latency).start()
+    os.environ['REZKA_ORIGIN'] = upstream.origin
+    # the stand-in never throttles; measure the app, not the upstream rate limit
+    os.environ.setdefault('UPSTREAM_RATE', '0')
+
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    from app import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app('production')
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    app_url = f"http://127.0.0.1:{server.server_port}"
+
+    results = {}
+    try:
+        for index, (name, make_request) in enumerate(scenarios(upstream.origin, seasons, episodes, translators).items()):
+            for phase in ('cold', 'warm'):
+                if phase == 'cold':
+                    clear_caches(app)
+                calls_before = upstream.total_calls
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()), RssSampler() as rss:
+                    latencies = drive(app_url, make_request, users, total, seed=index)
+                wall = time.perf_counter() - start
+                results[f'{name} [{phase}]'] = {
+                    'p50_ms': percentile(latencies, 50) * 1e3,
+                    'p95_ms': percentile(latencies, 95) * 1e3,
+                    'p99_ms': percentile(latencies, 99) * 1e3,
+                    'rps': total / wall,
+                    'upstream_per_request': (upstream.total_calls - calls_before) / total,
+                    'rss_growth_mb': rss.growth,
+                }
+    finally:
+        server.shutdown()
+        upstream.stop()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for name, metrics in results.items():
+        for metric, (higher_is_better, slack) in METRICS.items():
+            base = baseline.get(name, {}).get(metric)
+            if base is None:
+                continue
+            value = metrics[metric]
+            if higher_is_better and value < base * (1 - tolerance) - slack:
+                failures.append(f"{name} {metric}: {value:.2f} < baseline {base:.2f}")
+            elif not higher_is_better and value > base * (1 + tolerance) + slack + 1e-9:
+                failures.append(f"{name} {metric}: {value:.2f} > baseline {base:.2f}")
+    return failures
+
+
+def report(results):
+    print(f"{'endpoint':<29}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'upstream':>10}{'+RSS MB':>9}")
+    for name, m in results.items():
+        print(f"{name:<29}{m['p50_ms']:9.1f}{m['p95_ms']:9.1f}{m['p99_ms']:9.1f}{m['rps']:9.1f}"
+              f"{m['upstream_per_request']:10.2f}{m['rss_growth_mb']:9.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--store', help='fixture store (default: generated synthetic corpus)')
+    parser.add_argument('--users', type=int, default=8, help='concurrent simulated users')
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint')
+    parser.add_argument('--latency', type=float, default=0.05, help='simulated upstream latency in seconds')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative regression')
+    args = parser.parse_args()
+
+    seasons, episodes, translators = 4, 12, 20
+    # upstream calls and latencies depend on these; a baseline only applies to runs with the same ones
+    params = {'users': args.users, 'requests': args.requests, 'latency': args.latency, 'store': args.store or 'synthetic'}
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('params') != params:
+            print(f"Baseline {args.baseline} was recorded with {baseline.get('params')}, this run uses {params};")
+            print("not comparing. Re-run with the baseline's parameters, or with --save-baseline.")
+            sys.exit(2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.store:
+            store = FixtureStore(args.store)
+        else:
+            store = FixtureStore(tmp)
+            synthetic.fill_store(store, translators=translators, seasons=seasons, episodes=episodes)
+        results = run(store, args.users, args.requests, args.latency, seasons, episodes, translators)
+
+    print("=" * 84)
+    print(f"Endpoint benchmark: {args.users} users, {args.requests} requests/endpoint, "
+          f"{args.latency * 1e3:.0f} ms upstream latency")
+    print("=" * 84)
+    report(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'params': params, 'results': {
+                name: {k: round(v, 3) for k, v in m.items()} for name, m in results.items()}}, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif baseline is not None:
+        failures = compare(results, baseline['results'], args.tolerance)
+        if failures:
+            print("\nREGRESSIONS:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
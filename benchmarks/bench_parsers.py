@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Parse time and peak memory of every installed BeautifulSoup backend over fixture pages
+
+Usage:
+    python benchmarks/bench_parsers.py [--dir DIR | --store STORE_DIR] [--number N]
+
+Without options the synthetic pages from benchmarks/synthetic.py are used;
+--dir parses every *.html file in DIR and --store the HTML bodies and
+get_episodes fragments of a fixture store written by record_fixtures.py.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lib'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from HdRezkaApi.parsers import available_parsers, default_parser, make_soup
+from HdRezkaApi.extract import extract_title_fields
+from HdRezkaApi.replay import FixtureStore
+import synthetic
+
+
+def synthetic_fixtures():
+    seasons, episodes = synthetic.episodes_fragments()
+    return {
+        'title page': synthetic.title_page(),
+        'search page': synthetic.search_page(),
+        'home page': synthetic.home_page(),
+        'get_episodes seasons': seasons,
+        'get_episodes episodes': episodes,
+    }
+
+
+def directory_fixtures(path):
+    fixtures = {}
+    for filename in sorted(glob.glob(os.path.join(path, '*.html'))):
+        with open(filename, 'rb') as f:
+            fixtures[os.path.basename(filename)] = f.read()
+    return fixtures
+
+
+def store_fixtures(path):
+    """One fixture per kind of recorded response (first one found wins)"""
+    fixtures = {}
+    for entry in FixtureStore(path).entries():
+        request = entry['request']
+        body = FixtureStore.body(entry)
+        if request['path'].endswith('.html'):
+            fixtures.setdefault('title page', body)
+        elif request['path'] == '/':
+            fixtures.setdefault('home page', body)
+        elif request['path'] == '/search/':
+            fixtures.setdefault('search page', body)
+        elif request['path'].endswith('search.php'):
+            fixtures.setdefault('search.php fragment', body)
+        elif request['data'].get('action') == 'get_episodes':
+            data = json.loads(body)
+            if data.get('success'):
+                fixtures.setdefault('get_episodes seasons', data['seasons'])
+                fixtures.setdefault('get_episodes episodes', data['episodes'])
+    return fixtures
+
+
+def measure(func, markup, number):
+    """Best wall time of `number` runs and peak traced allocation of one run"""
+    best = float('inf')
+    for _ in range(number):
+        start = time.perf_counter()
+        func(markup)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(markup)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(fixtures, number):
+    backends = {name: (lambda markup, name=name: make_soup(markup, name)) for name in available_parsers()}
+    print(f"Installed backends: {', '.join(backends)} (default: {default_parser()})")
+    results = {}
+    for label, markup in fixtures.items():
+        print(f"\n{label}: {len(markup)} bytes")
+        candidates = dict(backends)
+        if 'title' in label:
+            candidates['extract (no tree)'] = extract_title_fields
+        for name, func in candidates.items():
+            seconds, peak = measure(func, markup, number)
+            results[(label, name)] = (seconds, peak)
+            print(f"  {name:<20} {seconds * 1e3:8.2f} ms   peak {peak / 1024:8.1f} KiB")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dir', help='directory of saved *.html pages')
+    parser.add_argument('--store', help='fixture store written by record_fixtures.py')
+    parser.add_argument('--number', type=int, default=20, help='timed runs per page and backend')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("HTML parser backend benchmark")
+    print("=" * 60)
+    if args.store:
+        fixtures = store_fixtures(args.store)
+    elif args.dir:
+        fixtures = directory_fixtures(args.dir)
+    else:
+        fixtures = synthetic_fixtures()
+    run(fixtures, args.number)
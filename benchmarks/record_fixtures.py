@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Record rezka.ag responses into a fixture store for offline replay
+
+Usage:
+    python benchmarks/record_fixtures.py STORE_DIR --url TITLE_URL [--url ...] [--query Q ...]
+    python benchmarks/record_fixtures.py STORE_DIR --synthetic
+
+For every title the page, get_episodes for each translator and one
+get_stream/get_movie are recorded; for every query both search.php and the
+first /search/ page. The home page is always recorded. --synthetic writes the
+generated corpus from benchmarks/synthetic.py instead of touching the network.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lib'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from HdRezkaApi import HdRezkaApi, HdRezkaSearch, HdRezkaSession, TVSeries
+from HdRezkaApi.replay import FixtureStore, RecordingTransport
+import synthetic
+
+
+def record(store, origin, urls, queries):
+    with HdRezkaSession(origin) as session:
+        transport = RecordingTransport(session.transport, store)
+        transport.get(session.origin, headers=session.HEADERS)
+        print(f"[RECORD] {session.origin}")
+
+        for url in urls:
+            rezka = HdRezkaApi(url, headers=session.HEADERS, cookies=session.cookies, transport=transport,
+                               title_cache=False, episodes_cache=False)
+            print(f"[RECORD] {url}: {rezka.name} ({rezka.type})")
+            try:
+                if rezka.type == TVSeries():
+                    season = rezka.episodesInfo[0]
+                    rezka.getStream(season['season'], season['episodes'][0]['episode'])
+                    print(f"[RECORD]   {len(rezka.seriesInfo)} translators, S{season['season']}E{season['episodes'][0]['episode']}")
+                else:
+                    rezka.getStream()
+            except Exception as e:
+                print(f"[RECORD]   stream not recorded: {e}")
+
+        for query in queries:
+            search = HdRezkaSearch(session.origin, headers=session.HEADERS, cookies=session.cookies, transport=transport)
+            fast = search.fast_search(query)
+            page = search.advanced_search(query)[0] or []
+            print(f"[RECORD] search {query!r}: {len(fast)} fast, {len(page)} on page 1")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('store', help='fixture store directory')
+    parser.add_argument('--origin', default='https://rezka.ag')
+    parser.add_argument('--url', action='append', default=[], help='title page to record (repeatable)')
+    parser.add_argument('--query', action='append', default=[], help='search query to record (repeatable)')
+    parser.add_argument('--synthetic', action='store_true', help='write the synthetic corpus instead')
+    args = parser.parse_args()
+
+    store = FixtureStore(args.store)
+    if args.synthetic:
+        synthetic.fill_store(store)
+        print(f"[RECORD] synthetic corpus written to {args.store}")
+    else:
+        record(store, args.origin, args.url, args.query)
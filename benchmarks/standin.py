@@ -0,0 +1,81 @@
+"""
+Local stand-in for rezka.ag that answers from a fixture store
+"""
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from HdRezkaApi.replay import FixtureStore
+
+HOP_HEADERS = ('connection', 'keep-alive', 'transfer-encoding', 'content-length', 'content-encoding')
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, store, latency=0, host='127.0.0.1', port=0):
+        super().__init__((host, port), StandInHandler)
+        self.store = store
+        self.latency = latency
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def origin(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def total_calls(self):
+        with self.lock:
+            return sum(self.calls.values())
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.replay('GET', dict(parse_qsl(urlsplit(self.path).query)), None)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        self.replay('POST', None, dict(parse_qsl(body)))
+
+    def replay(self, method, params, data):
+        server = self.server
+        path = urlsplit(self.path).path
+        with server.lock:
+            server.calls[f"{method} {path}"] += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        entry = server.store.load(method, server.origin + path, params=params, data=data)
+        if entry is None:
+            body = f"No recorded response for {method} {self.path}".encode('utf-8')
+            self.send_response(404)
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        else:
+            body = FixtureStore.body(entry)
+            self.send_response(entry['status'])
+            for name, value in entry['headers'].items():
+                if name.lower() not in HOP_HEADERS:
+                    self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
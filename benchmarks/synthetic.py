@@ -0,0 +1,174 @@
+"""
+Deterministic stand-ins for rezka.ag pages, shaped like the markup the library parses.
+
+Used by the benchmarks when no recorded fixtures are available.
+"""
+import base64
+import json
+import random
+import requests
+
+ORIGIN = "https://rezka.ag"
+TITLE_PATH = "/series/drama/79810-test-show-2025.html"
+POST_ID = 79810
+
+
+def _menu(rnd, links=120):
+    items = "".join(
+        f'<li class="b-topnav__sub_item"><a href="{ORIGIN}/series/genre-{i}/">Genre {i} {rnd.randint(1000, 9999)}</a></li>'
+        for i in range(links)
+    )
+    return f'<div class="b-topnav__menu"><ul class="b-topnav__sub_inner">{items}</ul></div>'
+
+
+def _comments(rnd, count=60):
+    return "".join(
+        f'<li class="comments-tree-item" data-id="{i}"><div class="b-comment"><div class="ava"><img src="{ORIGIN}/ava/{i}.png" /></div>'
+        f'<div class="message"><div class="info"><span class="name">user{i}</span><span class="date">{rnd.randint(1, 28)} мая 2025</span></div>'
+        f'<div class="text"><div id="comment-id-{i}">{"Комментарий " * rnd.randint(5, 40)}</div></div></div></div></li>'
+        for i in range(count)
+    )
+
+
+def title_page(translators=20, seed=0):
+    """Series title page with a translators list, rating, info table and comments"""
+    rnd = random.Random(seed)
+    flag = f' <img src="{ORIGIN}/i/flags/ua.png" title="Украинский" />'
+    items = "".join(
+        f'<li title="Студия {i}" class="b-translator__item{" active" if i == 0 else ""}{" b-prem_translator" if i % 7 == 6 else ""}" '
+        f'data-translator_id="{56 + i}" data-camrip="0" data-ads="0" data-director="0">Студия {i}{flag if i % 5 == 4 else ""}</li>'
+        for i in range(translators)
+    )
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8" />
+<title>Тестовый сериал (2025) смотреть онлайн</title>
+<meta property="og:title" content="Тестовый сериал" /><meta property="og:type" content="video.tv_series" />
+<meta property="og:image" content="{ORIGIN}/uploads/posters/{POST_ID}.jpg" />
+<script>var dle_root = '/'; var dle_skin = 'hdrezka';</script>
+</head><body class="b-theme__template"><div id="wrapper">
+<div class="b-topnav">{_menu(rnd)}</div>
+<div class="b-container b-content__main"><div class="b-content__columns">
+<div class="b-post__title"><h1 itemprop="name">Тестовый сериал / Test Show</h1></div>
+<div class="b-post__origtitle" itemprop="alternativeHeadline">Test Show</div>
+<div class="b-sidecover"><a href="{ORIGIN}/uploads/posters/{POST_ID}-hq.jpg"><img src="{ORIGIN}/uploads/posters/{POST_ID}.jpg" alt="" /></a></div>
+<table class="b-post__info">
+<tr><td class="l"><h2>Рейтинги</h2>:</td><td><span class="b-post__info_rates imdb">IMDb: <span class="bold">7.9</span></span></td></tr>
+<tr><td class="l"><h2>Дата выхода</h2>:</td><td>12 мая <a href="{ORIGIN}/year/2025/">2025 года</a></td></tr>
+<tr><td class="l"><h2>Страна</h2>:</td><td><a href="{ORIGIN}/country/usa/">США</a></td></tr>
+<tr><td class="l"><h2>В переводе</h2>:</td><td>Студия 0</td></tr>
+</table>
+<div class="b-post__description_text">{"Описание сериала. " * 40}</div>
+<div class="b-post__rating"><span class="b-post__rating_table"><span class="num">8.12</span><span class="votes">(<span>4521</span>)</span></span></div>
+<div class="b-translators__block"><ul id="translators-list" class="b-translators__list">{items}</ul></div>
+<div class="b-post__partcontent"></div>
+<input type="hidden" id="post_id" value="{POST_ID}" />
+<div id="user-favorites-holder" data-post_id="{POST_ID}"></div>
+<div class="b-comments__tree_list"><ol>{_comments(rnd)}</ol></div>
+</div></div>
+<script>$(function () {{ sof.tv.initCDNSeriesEvents({POST_ID}, 56, 1, 1, false, 'rezka.ag', false, {{"id":"cdnplayer"}}); }});</script>
+</div></body></html>"""
+
+
+def _inline_items(rnd, count):
+    return "".join(
+        f'<div class="b-content__inline_item" data-id="{1000 + i}" data-url="{ORIGIN}/films/comedy/{1000 + i}-film-{i}.html">'
+        f'<div class="b-content__inline_item-cover"><a href="{ORIGIN}/films/comedy/{1000 + i}-film-{i}.html">'
+        f'<img src="{ORIGIN}/uploads/mini/{1000 + i}.jpg" height="250" width="166" alt="" />'
+        f'<span class="cat {rnd.choice(["films", "series", "cartoons", "animation"])}"><i class="entity">Фильм</i><i class="icon"></i></span></a></div>'
+        f'<div class="b-content__inline_item-link"><a href="{ORIGIN}/films/comedy/{1000 + i}-film-{i}.html">Фильм номер {i}</a>'
+        f'<div>{rnd.randint(1990, 2025)}, США, Комедия</div></div></div>'
+        for i in range(count)
+    )
+
+
+def listing_page(items=36, seed=1, title="Смотреть фильмы онлайн"):
+    """Home page / full search results page: a grid of b-content__inline_item cards"""
+    rnd = random.Random(seed)
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8" /><title>{title}</title></head>
+<body><div id="wrapper"><div class="b-topnav">{_menu(rnd)}</div>
+<div class="b-content__main"><div class="b-content__inline"><div class="b-content__inline_items">{_inline_items(rnd, items)}</div></div>
+<div class="b-navigation"><a href="{ORIGIN}/page/2/">2</a></div></div></div></body></html>"""
+
+
+def home_page(items=36): return listing_page(items, seed=1)
+def search_page(items=36): return listing_page(items, seed=2, title="Поиск")
+
+
+def fast_search_fragment(items=5):
+    """Response body of /engine/ajax/search.php"""
+    rows = "".join(
+        f'<li><a href="{ORIGIN}/films/comedy/{1000 + i}-film-{i}.html"><span class="enty">Фильм номер {i}</span> (2020)'
+        f'<span class="rating"><i class="hd-tooltip">{7 + i / 10:.1f}</i></span></a></li>'
+        for i in range(items)
+    )
+    return f'<div class="b-search__section"><ul class="b-search__section_list">{rows}</ul></div>'
+
+
+def episodes_fragments(seasons=8, episodes=24):
+    """(`seasons`, `episodes`) HTML fields of a get_episodes response"""
+    seasons_html = '<ul id="simple-seasons-tabs" class="b-simple_seasons__list">' + "".join(
+        f'<li class="b-simple_season__item" data-tab_id="{s}">Сезон {s}</li>' for s in range(1, seasons + 1)
+    ) + "</ul>"
+    episodes_html = "".join(
+        f'<ul id="simple-episodes-list-{s}" class="b-simple_episodes__list">' + "".join(
+            f'<li class="b-simple_episode__item" data-id="{POST_ID}" data-season_id="{s}" data-episode_id="{e}">Серия {e}</li>'
+            for e in range(1, episodes + 1)
+        ) + "</ul>"
+        for s in range(1, seasons + 1)
+    )
+    return seasons_html, episodes_html
+
+
+def stream_payload(qualities=("360p", "480p", "720p", "1080p", "1080p Ultra"), chunk=60, seed=0):
+    """(plain, encoded) pair shaped like the `url` field of get_stream/get_movie"""
+    from HdRezkaApi.decoder import trash_tokens
+    rnd = random.Random(seed)
+    plain = ",".join(
+        f"[{q}]https://prx.cdn.net/s__/{rnd.randbytes(20).hex()}:2099010112:{rnd.randbytes(15).hex()}/{q.split()[0]}.mp4:hls:manifest.m3u8"
+        f" or https://prx.cdn.net/s__/{rnd.randbytes(20).hex()}:2099010112:{rnd.randbytes(15).hex()}/{q.split()[0]}.mp4"
+        for q in qualities
+    )
+    encoded = base64.b64encode(plain.encode("utf-8")).decode("utf-8")
+    parts = [encoded[i:i + chunk] for i in range(0, len(encoded), chunk)]
+    return plain, "#h" + "".join(part + "//_//" + rnd.choice(trash_tokens) for part in parts)
+
+
+def response(body, url, status=200, content_type="text/html; charset=utf-8"):
+    r = requests.Response()
+    r.status_code = status
+    r.reason = "OK" if status == 200 else "Error"
+    r.url = url
+    r.headers["Content-Type"] = content_type
+    r._content = body.encode("utf-8")
+    return r
+
+
+def json_response(data, url):
+    return response(json.dumps(data, ensure_ascii=False), url, content_type="application/json")
+
+
+def fill_store(store, translators=20, seasons=4, episodes=12, queries=("test",)):
+    """Write a complete synthetic corpus for one series title into a FixtureStore"""
+    cdn = f"{ORIGIN}/ajax/get_cdn_series/"
+    title_url = ORIGIN + TITLE_PATH
+    store.save("GET", title_url, response(title_page(translators), title_url))
+    store.save("GET", ORIGIN, response(home_page(), ORIGIN))
+    seasons_html, episodes_html = episodes_fragments(seasons, episodes)
+    for i in range(translators):
+        translator_id = 56 + i
+        data = {"id": POST_ID, "translator_id": translator_id, "action": "get_episodes"}
+        store.save("POST", cdn, json_response({"success": True, "seasons": seasons_html, "episodes": episodes_html}, cdn), data=data)
+        for season in range(1, seasons + 1):
+            for episode in range(1, episodes + 1):
+                _, url = stream_payload(seed=hash((translator_id, season, episode)) & 0xffff)
+                data = {"id": POST_ID, "translator_id": translator_id, "season": season, "episode": episode, "action": "get_stream"}
+                store.save("POST", cdn, json_response({
+                    "success": True, "url": url,
+                    "subtitle": f"[Русский]{ORIGIN}/subs/{season}_{episode}_ru.vtt,[English]{ORIGIN}/subs/{season}_{episode}_en.vtt",
+                    "subtitle_lns": {"Русский": "ru", "English": "en"}
+                }, cdn), data=data)
+    for query in queries:
+        search_url = f"{ORIGIN}/engine/ajax/search.php"
+        store.save("POST", search_url, response(fast_search_fragment(), search_url), data={"q": query})
+        listing_url = f"{ORIGIN}/search/"
+        store.save("GET", listing_url, response(search_page(), listing_url),
+            params={"do": "search", "subaction": "search", "q": query, "page": 1})
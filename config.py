@@ -7,7 +7,25 @@ import os
 class Config:
     """Base configuration"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'hdrezka-secret-key-2024'
-    BASE_URL = "https://rezka.ag"
+    BASE_URL = os.environ.get('REZKA_ORIGIN') or "https://rezka.ag"
+
+    # Next-episode prefetch after /api/stream (0 episodes disables it)
+    PREFETCH_EPISODES = int(os.environ.get('PREFETCH_EPISODES') or 2)
+    PREFETCH_RATE = float(os.environ.get('PREFETCH_RATE') or 1.0)  # upstream requests per second
+
+    # Adaptive per-origin limit on upstream requests (0 disables it); halves on 429/503 or blocked streams
+    UPSTREAM_RATE = float(os.environ.get('UPSTREAM_RATE') or 4.0)  # starting requests per second
+    UPSTREAM_MAX_RATE = float(os.environ.get('UPSTREAM_MAX_RATE') or 16.0)
+    UPSTREAM_MAX_WAIT = float(os.environ.get('UPSTREAM_MAX_WAIT') or 10.0)  # seconds a request may queue before a 429
+
+    # Headless-browser egress route, tried after direct and the Cloudflare Worker (needs playwright, ~512 MB)
+    BROWSER_FALLBACK = (os.environ.get('BROWSER_FALLBACK') or '').lower() in ('1', 'true', 'yes')
+    BROWSER_POOL_SIZE = int(os.environ.get('BROWSER_POOL_SIZE') or 1)  # warm Chromium processes
+    BROWSER_MAX_PAGES = int(os.environ.get('BROWSER_MAX_PAGES') or 2)  # concurrent pages across the pool
+
+    # Home-page feed snapshot served by / (optional file keeps it across restarts)
+    FEED_REFRESH_SECONDS = int(os.environ.get('FEED_REFRESH_SECONDS') or 600)  # at least 60
+    FEED_SNAPSHOT_PATH = os.environ.get('FEED_SNAPSHOT_PATH') or None
 
     # Flask settings
     DEBUG = True
@@ -31,9 +49,16 @@ class ProductionConfig(Config):
     SESSION_COOKIE_SECURE = True
 
 
+class TestingConfig(Config):
+    """Testing configuration: no background scraping or prefetching"""
+    TESTING = True
+    PREFETCH_EPISODES = 0
+
+
 # Configuration dictionary
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
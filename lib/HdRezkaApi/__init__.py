@@ -3,8 +3,11 @@ __version__ = "11.1.0"
 from .api import HdRezkaApi
 from .search import HdRezkaSearch
 from .session import HdRezkaSession
+from .transport import HdRezkaTransport
 from .types import (TVSeries, Movie)
 from .types import (Film, Series, Cartoon, Anime)
 from .types import (HdRezkaFormat, HdRezkaCategory)
 from .types import (HdRezkaRating, HdRezkaEmptyRating)
-from .errors import (LoginRequiredError, LoginFailed, FetchFailed, CaptchaError, HTTP)
+from .errors import (LoginRequiredError, LoginFailed, FetchFailed, CaptchaError, RateLimited, HTTP)
+from .aio import (AsyncHdRezkaApi, AsyncHdRezkaSearch, AsyncHdRezkaSession, AsyncHdRezkaTransport)
+from .bulk import (BulkResolver, StreamCheckpoint)
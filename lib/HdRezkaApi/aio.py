@@ -0,0 +1,490 @@
+import asyncio
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+	import aiohttp
+except ImportError: # optional: pip install aiohttp
+	aiohttp = None
+
+from .api import HdRezkaApi
+from .search import HdRezkaSearch, SearchResult, normalize_query
+from .cache import default_search_cache, default_search_pages_cache
+from .transport import backoff_delay, coalesce_key
+from .ratelimit import default_limiter
+from .types import TVSeries
+from .types import default_cookies, default_headers
+from .types import default_translators_priority, default_translators_non_priority
+from .errors import HTTP, LoginFailed
+
+
+def _proxy_url(proxies):
+	"""requests-style proxies dict -> the single proxy url aiohttp takes"""
+	if not proxies or isinstance(proxies, str): return proxies or None
+	return proxies.get("https") or proxies.get("http")
+
+
+def _response(url, status, reason, headers, cookies, body):
+	"""Wrap an aiohttp reply in a requests.Response so the sync parsers can consume it"""
+	r = requests.Response()
+	r.url = url
+	r.status_code = status
+	r.reason = reason
+	r.headers = CaseInsensitiveDict(headers)
+	r.encoding = get_encoding_from_headers(r.headers)
+	r._content = body
+	for name, morsel in cookies.items():
+		r.cookies.set(name, morsel.value)
+	return r
+
+
+class _OfflineTransport:
+	"""Transport of the wrapped sync client: the async side fetches everything up front"""
+	def request(self, method, url, **kwargs):
+		raise RuntimeError(f"Unexpected blocking request from the async client: {method} {url}")
+	def get(self, url, **kwargs): return self.request("GET", url, **kwargs)
+	def post(self, url, **kwargs): return self.request("POST", url, **kwargs)
+
+
+class AsyncHdRezkaTransport:
+	"""aiohttp counterpart of HdRezkaTransport; answers with requests.Response objects"""
+	def __init__(self, session=None, limit=100, limit_per_host=10, retries=3,
+		backoff_factor=0.3, status_forcelist=(500, 502, 504), timeout=None,
+		coalesce=True, rate_limit=None
+	):
+		if aiohttp is None: raise ImportError("The async client requires aiohttp (pip install aiohttp)")
+		self._session = session
+		self._own_session = session is None
+		self.limit = limit
+		self.limit_per_host = limit_per_host
+		self.retries = retries
+		self.backoff_factor = backoff_factor
+		self.status_forcelist = status_forcelist
+		self.timeout = timeout
+		self.coalesce = coalesce
+		self.coalesced = 0
+		self._inflight = {}
+		if rate_limit is None: rate_limit = default_limiter()
+		self.rate_limit = rate_limit or None
+
+	@property
+	def session(self):
+		if self._session is None:
+			self._session = aiohttp.ClientSession(
+				connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host),
+				cookie_jar=aiohttp.DummyCookieJar() # cookies are passed per request, never shared between users
+			)
+		return self._session
+
+	async def request(self, method, url, **kwargs):
+		key = coalesce_key(method, url, kwargs) if self.coalesce else None
+		if key is None: return await self._request(method, url, **kwargs)
+		task = self._inflight.get(key)
+		if task is not None:
+			self.coalesced += 1
+			return await asyncio.shield(task)
+		task = self._inflight[key] = asyncio.ensure_future(self._request(method, url, **kwargs))
+		task.add_done_callback(lambda _: self._inflight.pop(key, None))
+		return await asyncio.shield(task)
+
+	async def _request(self, method, url, **kwargs):
+		if self.rate_limit is None: return await self._send(method, url, **kwargs)
+		bucket, delay = self.rate_limit.reserve(url, kwargs)
+		if delay: await asyncio.sleep(delay)
+		response = await self._send(method, url, **kwargs)
+		self.rate_limit.feedback(bucket, response)
+		return response
+
+	async def _send(self, method, url, proxies=None, timeout=None, params=None, **kwargs):
+		timeout = timeout or self.timeout
+		if timeout: kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+		if params: kwargs["params"] = {k: str(v) for k, v in params.items()}
+		attempt = 0
+		while True:
+			try:
+				async with self.session.request(method, url, proxy=_proxy_url(proxies), **kwargs) as r:
+					body = await r.read()
+					if r.status not in self.status_forcelist or attempt >= self.retries:
+						return _response(str(r.url), r.status, r.reason, r.headers, r.cookies, body)
+			except aiohttp.ClientConnectionError:
+				if attempt >= self.retries: raise
+			await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+			attempt += 1
+
+	async def get(self, url, **kwargs): return await self.request("GET", url, **kwargs)
+	async def post(self, url, **kwargs): return await self.request("POST", url, **kwargs)
+
+	async def close(self):
+		if self._own_session and self._session is not None:
+			await self._session.close()
+			self._session = None
+
+	async def __aenter__(self): return self
+	async def __aexit__(self, type, value, traceback): await self.close()
+
+
+class AsyncHdRezkaApi:
+	"""asyncio HdRezkaApi: properties are coroutines (`await rezka.translators()`), parsing is the sync client's"""
+	def __init__(self, url, proxy={}, headers={}, cookies={},
+		translators_priority=None, translators_non_priority=None,
+		use_cloudflare_proxy=None, transport=None, title_cache=None, episodes_cache=None,
+		series_workers=8, request_timeout=None, parser=None, stream_cache=None, egress=None
+	):
+		self.api = HdRezkaApi(url, proxy=proxy, headers=headers, cookies=cookies,
+			translators_priority=translators_priority, translators_non_priority=translators_non_priority,
+			use_cloudflare_proxy=use_cloudflare_proxy, transport=_OfflineTransport(),
+			title_cache=title_cache, episodes_cache=episodes_cache,
+			series_workers=series_workers, request_timeout=request_timeout, parser=parser,
+			stream_cache=stream_cache, egress=egress
+		)
+		self._own_transport = transport is None
+		self.transport = transport or AsyncHdRezkaTransport()
+		self._lock = asyncio.Lock()
+
+	def __str__(self): return f'AsyncHdRezka("{self.url}")'
+	def __repr__(self): return str(self)
+
+	async def __aenter__(self): return self
+	async def __aexit__(self, type, value, traceback): await self.close()
+
+	async def close(self):
+		if self._own_transport: await self.transport.close()
+
+	@property
+	def url(self): return self.api.url
+	@property
+	def origin(self): return self.api.origin
+	@property
+	def cookies(self): return self.api.cookies
+	@property
+	def HEADERS(self): return self.api.HEADERS
+	@property
+	def seriesInfoErrors(self): return self.api.seriesInfoErrors
+
+	def _fetched(self, name): return name in self.api.__dict__
+
+	async def _page(self):
+		if not self._fetched("page"):
+			api = self.api
+			r = await self.transport.get(api.url, allow_redirects=True, headers=api.HEADERS, proxies=api.proxy, cookies=api.cookies)
+			if not r.ok: raise HTTP(r.status_code, r.reason)
+			api.__dict__["page"] = r
+		return self.api.page
+
+	async def meta(self):
+		api = self.api
+		if not self._fetched("meta"):
+			async with self._lock:
+				if not self._fetched("meta"):
+					key = api._cache_key
+					meta = api.title_cache.get(key) if api.title_cache is not None and key is not None else None
+					if meta is None:
+						await self._page()
+						meta = await asyncio.to_thread(api._parse_meta) # parse off the event loop
+						if api.title_cache is not None and key is not None: api.title_cache.set(key, meta)
+					api.__dict__["meta"] = meta
+		return api.meta
+
+	async def _field(self, name, field=None):
+		meta = await self.meta()
+		field = field or name
+		if field in self.api.title_fields and field not in meta:
+			await self._page() # soup fallback
+		return getattr(self.api, name)
+
+	async def ok(self):
+		try: return True if await self.meta() else False
+		except Exception: return False
+
+	async def exception(self):
+		try: await self.meta()
+		except Exception as e: return e
+
+	async def login(self, email:str, password:str, raise_exception=True):
+		api = self.api
+		response = await self.transport.post(f"{api.origin}/ajax/login/", data={"login_name":email,"login_password":password}, headers=api.HEADERS, proxies=api.proxy)
+		data = response.json()
+		if data['success']:
+			api.cookies = {**api.cookies, **response.cookies.get_dict()}
+			return True
+		if raise_exception: raise LoginFailed(data.get("message"))
+
+	async def id(self): return await self._field("id")
+	async def name(self): return await self._field("name", "names")
+	async def names(self): return await self._field("names")
+	async def origName(self): return await self._field("origName", "origNames")
+	async def origNames(self): return await self._field("origNames")
+	async def description(self): return await self._field("description")
+	async def thumbnail(self): return await self._field("thumbnail")
+	async def thumbnailHQ(self): return await self._field("thumbnailHQ")
+	async def releaseYear(self): return await self._field("releaseYear")
+	async def type(self): return await self._field("type")
+	async def rating(self): return await self._field("rating")
+	async def translators(self): return await self._field("translators")
+	async def translators_names(self): return await self._field("translators_names", "translators")
+	async def category(self): return self.api.category
+
+	async def otherParts(self):
+		await self._page()
+		return await asyncio.to_thread(lambda: self.api.otherParts)
+
+	async def _cdn_series(self, data, timeout=None):
+		"""EgressRouter.call over the async transport; routes without an HTTP form run in a thread"""
+		api = self.api
+		timeout = timeout or api.request_timeout
+		dispatch = api.egress.dispatch(data, api.egress_exclude)
+		try:
+			for route in dispatch:
+				try:
+					request = route.request(api, data, timeout)
+					if request is None: dispatch.done(await asyncio.to_thread(route.send, api, data, timeout))
+					else: dispatch.done((await self.transport.post(request[0], **request[1])).json())
+				except Exception as e:
+					dispatch.failed(e)
+		finally: dispatch.close() # a cancelled call gives a half-open trial back
+		return dispatch.result()
+
+	async def translatorEpisodes(self, translator_id):
+		api = self.api
+		await self.meta()
+		if api._has_episodes(translator_id): return api._episodes[translator_id]
+		response = await self._cdn_series({
+			"id": api.id,
+			"translator_id": translator_id,
+			"action": "get_episodes"
+		})
+		return await asyncio.to_thread(api._episodes_entry, translator_id, response)
+
+	async def seriesInfo(self):
+		api = self.api
+		if self._fetched("seriesInfo"): return api.seriesInfo
+		if await self.type() != TVSeries:
+			raise ValueError("The `seriesInfo` attribute is only available for TVSeries.")
+		translators = list(api.translators)
+		semaphore = asyncio.Semaphore(api.series_workers or 1)
+		errors = {}
+		async def fetch(tr_id):
+			async with semaphore:
+				try: await self.translatorEpisodes(tr_id)
+				except Exception as e: errors[tr_id] = e
+		await asyncio.gather(*map(fetch, translators))
+		api.__dict__["seriesInfo"] = api._collect_series(translators, errors)
+		return api.seriesInfo
+
+	async def episodesInfo(self):
+		await self.seriesInfo()
+		return self.api.episodesInfo
+
+	async def getStream(self, season=None, episode=None, translation=None,
+		priority=None, non_priority=None
+	):
+		api = self.api
+		await self.meta()
+		if api.type == TVSeries and season and episode:
+			# same lookup order as the sync client: the requested translator first, the whole graph if needed
+			tr_id = api._find_translator(translation) if translation else None
+			entry = await self.translatorEpisodes(tr_id) if tr_id is not None else None
+			if not api._has_episode(entry, season, episode): await self.seriesInfo()
+		data = api._stream_request(season, episode, translation, priority, non_priority)
+		return await self._fetch_stream(data, season, episode)
+
+	async def _fetch_stream(self, data, season=None, episode=None):
+		api = self.api
+		stream = api._cached_stream(data)
+		if stream is not None: return stream
+		return api._store_stream(data, api._stream_response(data, await self._cdn_series(data), season, episode))
+
+	async def getSeasonStreams(self, season, translation=None,
+		priority=None, non_priority=None,
+		ignore=False, progress=None
+	):
+		"""Async generator of (episode, stream), streams resolved concurrently up to `series_workers`"""
+		if not progress: progress = lambda cur, all: None
+		await self.seriesInfo()
+		tr_id, series = self.api._season_plan(season, translation, priority, non_priority)
+		progress(0, len(series))
+		semaphore = asyncio.Semaphore(self.api.series_workers or 1)
+		done = []
+		stopped = asyncio.Event() # set when the generator is closed: pending calls stop retrying
+
+		async def make_call(episode):
+			api = self.api
+			data = api._series_request(season, episode, tr_id)
+			attempt = 0
+			while not stopped.is_set():
+				try:
+					async with semaphore:
+						if stopped.is_set(): return None
+						return await self._fetch_stream(data, season, episode)
+				except Exception as e:
+					if ignore or attempt == 0:
+						try:
+							await asyncio.wait_for(stopped.wait(), backoff_delay(attempt, base=1))
+							return None
+						except asyncio.TimeoutError: pass
+						attempt += 1
+						continue
+					print(f"{e.__class__.__name__} > ep:{episode}: {e}")
+					return None
+
+		async def tracked(episode):
+			stream = await make_call(episode)
+			done.append(episode)
+			progress(len(done), len(series))
+			return stream
+
+		tasks = [asyncio.ensure_future(tracked(episode)) for episode in series]
+		try:
+			for episode, task in zip(series, tasks):
+				yield episode, await task
+		finally:
+			stopped.set()
+			for task in tasks: task.cancel()
+
+	# snake_case aliases
+	get_stream = getStream
+	get_season_streams = getSeasonStreams
+	series_info = seriesInfo
+	episodes_info = episodesInfo
+	translator_episodes = translatorEpisodes
+
+
+class AsyncSearchResult:
+	def __init__(self, origin, query, proxy=None, headers=None, cookies=None, transport=None, parser=None, cache=None):
+		self.origin = origin
+		self.query = normalize_query(query)
+		self.proxy = proxy
+		self.headers = headers
+		self.cookies = cookies
+		self.transport = transport
+		self.parser = parser
+		if cache is None: cache = default_search_pages_cache
+		self.cache = cache if cache is not False else None
+		self._pages = {}
+	def __str__(self): return f"AsyncSearchResult({self.query})"
+
+	async def __aiter__(self):
+		page = 1
+		while True:
+			result = await self.get_page(page)
+			if not result: break
+			yield result
+			page += 1
+
+	async def get_page(self, page):
+		key = ("page", self.origin, self.query, page)
+		if page not in self._pages and self.cache is not None:
+			cached = self.cache.get(key)
+			if cached is not None: self._pages[page] = cached
+		if page not in self._pages:
+			data = {
+				'do': 'search',
+				'subaction': 'search',
+				'q': self.query,
+				'page': page
+			}
+			r = await self.transport.get(f'{self.origin}/search/', params=data, headers=self.headers, proxies=self.proxy, cookies=self.cookies)
+			self._pages[page] = await asyncio.to_thread(SearchResult.parse_page, r.content, self.parser) if r.ok else None
+			if self.cache is not None and self._pages[page] is not None: self.cache.set(key, self._pages[page])
+		return self._pages[page]
+
+	async def all_pages(self): return [page async for page in self]
+	async def all(self): return [item async for page in self for item in page]
+
+
+class AsyncHdRezkaSearch:
+	def __init__(self, origin, proxy={}, headers={}, cookies={}, transport=None, parser=None, cache=None, pages_cache=None):
+		uri = urlparse(origin)
+		self.origin = f'{uri.scheme}://{uri.netloc}'
+		self.proxy = proxy
+		self.cookies = {**default_cookies, **cookies}
+		self.HEADERS = {**default_headers, **headers}
+		self._own_transport = transport is None
+		self.transport = transport or AsyncHdRezkaTransport()
+		self.parser = parser
+		if cache is None: cache = default_search_cache
+		self.cache = cache if cache is not False else None
+		if pages_cache is None and cache is False: pages_cache = False # cache=False disables the /search/ pages cache too
+		self.pages_cache = pages_cache
+
+	async def __aenter__(self): return self
+	async def __aexit__(self, type, value, traceback): await self.close()
+
+	async def close(self):
+		if self._own_transport: await self.transport.close()
+
+	async def __call__(self, query, find_all=False):
+		return self.advanced(query) if find_all else await self.fast(query)
+
+	async def fast(self, query):
+		query = normalize_query(query)
+		key = ("fast", self.origin, query)
+		results = self.cache.get(key) if self.cache is not None else None
+		if results is None:
+			r = await self.transport.post(f'{self.origin}/engine/ajax/search.php', data={'q': query}, headers=self.HEADERS, proxies=self.proxy, cookies=self.cookies)
+			if not r.ok: raise HTTP(r.status_code, r.reason)
+			results = await asyncio.to_thread(HdRezkaSearch.parse_fast_search, r.content, self.parser)
+			if self.cache is not None: self.cache.set(key, results)
+		return list(results)
+
+	def advanced(self, query):
+		return AsyncSearchResult(self.origin, query, proxy=self.proxy, cookies=self.cookies, headers=self.HEADERS, transport=self.transport, parser=self.parser, cache=self.pages_cache)
+
+	fast_search = fast
+	advanced_search = advanced
+
+
+class AsyncHdRezkaSession:
+	def __init__(self, origin="", proxy={}, headers={}, cookies={},
+		translators_priority=None, translators_non_priority=None,
+		transport=None, limit=100, limit_per_host=10, retries=3, parser=None
+	):
+		self.origin = None
+		if origin:
+			uri = urlparse(origin)
+			self.origin = f'{uri.scheme}://{uri.netloc}'
+		self.proxy = proxy
+		self.cookies = {**default_cookies, **cookies}
+		self.HEADERS = {**default_headers, **headers}
+		self._translators_priority = translators_priority or default_translators_priority
+		self._translators_non_priority = translators_non_priority or default_translators_non_priority
+		self._own_transport = transport is None
+		self.transport = transport or AsyncHdRezkaTransport(limit=limit, limit_per_host=limit_per_host, retries=retries)
+		self.parser = parser
+
+	async def __aenter__(self): return self
+	async def __aexit__(self, type, value, traceback): await self.close()
+
+	async def close(self):
+		if self._own_transport: await self.transport.close()
+
+	async def login(self, email:str, password:str, **kwargs):
+		if not self.origin: raise ValueError("For login origin is required")
+		rezka = AsyncHdRezkaApi(self.origin, headers=self.HEADERS, proxy=self.proxy, transport=self.transport, parser=self.parser)
+		if await rezka.login(email=email, password=password, **kwargs):
+			self.cookies = {**self.cookies, **rezka.cookies}
+			return True
+
+	async def get(self, url, **kwargs):
+		if self.origin:
+			uri = urlparse(url)
+			url = self.origin+"/"+uri.path.lstrip("/")
+		rezka = AsyncHdRezkaApi(url, **{
+			"proxy": self.proxy,
+			"headers": self.HEADERS,
+			"cookies": self.cookies,
+			"translators_priority": self._translators_priority,
+			"translators_non_priority": self._translators_non_priority,
+			"transport": self.transport,
+			"parser": self.parser,
+			**kwargs
+		})
+		if await rezka.ok(): return rezka
+		else: raise await rezka.exception()
+
+	async def search(self, query, find_all=False):
+		if not self.origin: raise ValueError("For search origin is required")
+		return await AsyncHdRezkaSearch(self.origin, proxy=self.proxy, headers=self.HEADERS, cookies=self.cookies, transport=self.transport, parser=self.parser)(query, find_all=find_all)
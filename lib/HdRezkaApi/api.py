@@ -1,13 +1,18 @@
-import requests
-from bs4 import BeautifulSoup
-import base64
-from itertools import product
 from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
-import time
+import threading
 import re
 
 from .stream import HdRezkaStream
+from .availability import EpisodeAvailability
+from .translators import TranslatorIndex
+from .decoder import clear_trash
+from .extract import extract_title_fields
+from .parsers import make_soup
+from .transport import default_transport, backoff_delay
+from .egress import default_egress
+from .cache import default_title_cache, default_episodes_cache, default_stream_cache
 from .types import BeautifulSoupCustom
 from .types import (TVSeries, Movie)
 from .types import (Film, Series, Cartoon, Anime)
@@ -21,7 +26,10 @@ from .errors import (LoginRequiredError, LoginFailed, FetchFailed, CaptchaError,
 class HdRezkaApi():
 	def __init__(self, url, proxy={}, headers={}, cookies={},
 		translators_priority=None, translators_non_priority=None,
-		use_cloudflare_proxy=None  # New: Optional Cloudflare Worker proxy
+		use_cloudflare_proxy=None,  # New: Optional Cloudflare Worker proxy
+		transport=None, title_cache=None, episodes_cache=None,
+		series_workers=8, request_timeout=None, parser=None, stream_cache=None,
+		egress=None
 	):
 		self.url = url.split(".html")[0] + ".html"
 		uri = urlparse(url)
@@ -31,12 +39,27 @@ class HdRezkaApi():
 		self.HEADERS = {**default_headers, **headers}
 		self._translators_priority = translators_priority or default_translators_priority
 		self._translators_non_priority = translators_non_priority or default_translators_non_priority
+		self.transport = transport or default_transport()
+		if title_cache is None: title_cache = default_title_cache
+		self.title_cache = title_cache if title_cache is not False else None
+		if episodes_cache is None: episodes_cache = default_episodes_cache
+		self.episodes_cache = episodes_cache if episodes_cache is not False else None
+		if stream_cache is None: stream_cache = default_stream_cache
+		self.stream_cache = stream_cache if stream_cache is not False else None
+		self.series_workers = series_workers
+		self.request_timeout = request_timeout
+		self.seriesInfoErrors = {}
+		self.parser = parser
+		self._episodes = {}
 
 		# Cloudflare Worker proxy configuration
 		import os
 		self.cloudflare_worker_url = os.getenv('CLOUDFLARE_WORKER_URL', '')
 		# Auto-enable if URL is set, unless explicitly disabled
 		self.use_cloudflare_proxy = use_cloudflare_proxy if use_cloudflare_proxy is not None else bool(self.cloudflare_worker_url)
+		# get_cdn_series goes over the healthiest route (direct, worker, ...); health is shared process-wide
+		self.egress = egress or default_egress()
+		self.egress_exclude = ("worker",) if use_cloudflare_proxy is False else ()
 
 	def __str__(self): return f'HdRezka("{self.name}")'
 	def __repr__(self): return str(self)
@@ -48,6 +71,7 @@ class HdRezkaApi():
 	@translators_priority.setter
 	def translators_priority(self, value):
 		self._translators_priority = value or []
+		self.__dict__.pop("translator_index", None)
 
 	@property
 	def translators_non_priority(self):
@@ -56,20 +80,21 @@ class HdRezkaApi():
 	@translators_non_priority.setter
 	def translators_non_priority(self, value):
 		self._translators_non_priority = value or []
+		self.__dict__.pop("translator_index", None)
 
 	@property
 	def ok(self):
-		try: return True if self.soup else False
+		try: return True if self.meta else False
 		except: return False
 
 	@property
 	def exception(self):
 		if not self.ok:
-			try: self.soup
+			try: self.meta
 			except Exception as e: return e
 
 	def login(self, email:str, password:str, raise_exception=True):
-		response = requests.post(f"{self.origin}/ajax/login/",data={"login_name":email,"login_password":password},headers=self.HEADERS,proxies=self.proxy)
+		response = self.transport.post(f"{self.origin}/ajax/login/",data={"login_name":email,"login_password":password},headers=self.HEADERS,proxies=self.proxy)
 		data = response.json()
 		if data['success']:
 			self.cookies = {**self.cookies,**response.cookies.get_dict()}
@@ -83,19 +108,56 @@ class HdRezkaApi():
 
 	@cached_property
 	def page(self):
-		r = requests.get(self.url, allow_redirects=True, headers=self.HEADERS, proxies=self.proxy, cookies=self.cookies)
+		r = self.transport.get(self.url, allow_redirects=True, headers=self.HEADERS, proxies=self.proxy, cookies=self.cookies)
 		if r.ok: return r
 		raise HTTP(r.status_code, r.reason)
 
 	@cached_property
 	def soup(self):
-		s = BeautifulSoupCustom(self.page.content, 'html.parser')
+		s = make_soup(self.page.content, self.parser, cls=BeautifulSoupCustom)
 		if s.title.text == "Sign In": raise LoginRequiredError()
 		if s.title.text == "Verify": raise CaptchaError()
 		return s
 
 	@cached_property
-	def id(self):
+	def meta(self):
+		"""Parsed title fields, shared between instances through `title_cache`"""
+		key = self._cache_key
+		if self.title_cache is None or key is None: return self._parse_meta()
+		return self.title_cache.get_or_load(key, self._parse_meta)
+
+	@cached_property
+	def _cache_key(self):
+		# per origin: mirrors serve their own thumbnails and translator sets
+		post_id = self.url.split("/")[-1].split("-")[0]
+		return (self.origin, int(post_id)) if post_id.isnumeric() else None
+
+	title_fields = ("id", "names", "origNames", "description", "translators", "type",
+		"rating", "thumbnail", "thumbnailHQ", "releaseYear")
+
+	def _parse_meta(self):
+		fields = extract_title_fields(self.page.content)
+		if "title" not in fields: self.soup # let the full parser raise
+		if fields.get("title") == "Sign In": raise LoginRequiredError()
+		if fields.get("title") == "Verify": raise CaptchaError()
+		meta = {}
+		for field in self.title_fields:
+			if field in fields:
+				meta[field] = fields[field]
+				continue
+			# BeautifulSoup fallback for anything the fast extractor missed
+			try: meta[field] = getattr(self, f"_parse_{field}")()
+			except Exception: pass # left to the property, which raises on access
+		return meta
+
+	def _meta_field(self, field):
+		if field in self.meta: return self.meta[field]
+		return getattr(self, f"_parse_{field}")()
+
+	@cached_property
+	def id(self): return self._meta_field("id")
+
+	def _parse_id(self):
 		def get_val(el, attr): return el.attrs.get(attr) if el else None
 		return int(
 			get_val(self.soup.find(id="post_id"), 'value') or
@@ -108,7 +170,9 @@ class HdRezkaApi():
 	def name(self): return self.names[0]
 
 	@cached_property
-	def names(self):
+	def names(self): return list(self._meta_field("names"))
+
+	def _parse_names(self):
 		return list(map(
 			lambda s: s.strip(),
 			self.soup.find(class_="b-post__title").get_text().split("/")
@@ -119,7 +183,9 @@ class HdRezkaApi():
 		return self.origNames[-1] if self.origNames else None
 
 	@cached_property
-	def origNames(self):
+	def origNames(self): return list(self._meta_field("origNames"))
+
+	def _parse_origNames(self):
 		el = self.soup.find(class_="b-post__origtitle")
 		if el:
 			return list(map(
@@ -129,19 +195,27 @@ class HdRezkaApi():
 		return []
 
 	@cached_property
-	def description(self):
+	def description(self): return self._meta_field("description")
+
+	def _parse_description(self):
 		return self.soup.find(class_="b-post__description_text").get_text().strip()
 
 	@cached_property
-	def thumbnail(self):
+	def thumbnail(self): return self._meta_field("thumbnail")
+
+	def _parse_thumbnail(self):
 		return self.soup.find(class_="b-sidecover").find('img').attrs['src']
 
 	@cached_property
-	def thumbnailHQ(self):
+	def thumbnailHQ(self): return self._meta_field("thumbnailHQ")
+
+	def _parse_thumbnailHQ(self):
 		return self.soup.find(class_="b-sidecover").find('a').attrs['href']
 
 	@cached_property
-	def releaseYear(self):
+	def releaseYear(self): return self._meta_field("releaseYear")
+
+	def _parse_releaseYear(self):
 		el = self.soup.select_one('.b-content__main .b-post__info a[href*="/year/"]')
 		if el:
 			match = re.search(r'\d{4}', el.get('href', ''))
@@ -150,11 +224,14 @@ class HdRezkaApi():
 
 	@cached_property
 	def type(self):
-		type_str = self.soup.find('meta', property="og:type").attrs['content']
+		type_str = self._meta_field("type")
 		if type_str == "video.tv_series": return TVSeries()
 		if type_str == "video.movie": return Movie()
 		return HdRezkaFormat(type_str)
 
+	def _parse_type(self):
+		return self.soup.find('meta', property="og:type").attrs['content']
+
 	@cached_property
 	def category(self):
 		uri = urlparse(self.url)
@@ -167,16 +244,25 @@ class HdRezkaApi():
 
 	@cached_property
 	def rating(self):
+		rating = self._meta_field("rating")
+		if rating:
+			return HdRezkaRating(value=rating[0], votes=rating[1])
+		else:
+			return HdRezkaEmptyRating()
+
+	def _parse_rating(self):
 		wraper = self.soup.find(class_='b-post__rating')
 		if wraper:
 			rating = wraper.find(class_='num').get_text()
 			votes = wraper.find(class_='votes').get_text().strip("()")
-			return HdRezkaRating(value=float(rating), votes=int(votes))
-		else:
-			return HdRezkaEmptyRating()
+			return [float(rating), int(votes)]
+		return None
 
 	@cached_property
 	def translators(self):
+		return {id: dict(info) for id, info in self._meta_field("translators").items()}
+
+	def _parse_translators(self):
 		arr = {}
 		translators = self.soup.find(id="translators-list")
 		if translators:
@@ -187,7 +273,7 @@ class HdRezkaApi():
 				img = child.find('img')
 				if img:
 					lang = img.attrs.get('title')
-					if not lang in name:
+					if lang and not lang in name:
 						name += f" ({lang})"
 
 				arr[id] = {"name": name, "premium": premium}
@@ -203,25 +289,21 @@ class HdRezkaApi():
 			def getTranslationID(s):
 				initCDNEvents = {'video.tv_series': 'initCDNSeriesEvents',
 								 'video.movie'    : 'initCDNMoviesEvents'}
-				tmp = s.text.split(f"sof.tv.{initCDNEvents[f'video.{self.type.name}']}")[-1].split("{")[0]
+				tmp = s.text.split(f"sof.tv.{initCDNEvents[self._parse_type()]}")[-1].split("{")[0]
 				return int(tmp.split(",")[1].strip())
 
 			arr[getTranslationID(self.page)] = {"name": getTranslationName(self.soup), "premium": False}
 		return arr
 
-	def sort_translators(self, translators=None, priority=None, non_priority=None):
-		prior = {}
-		for index, item in enumerate(priority if isinstance(priority, list) else self._translators_priority or []):
-			prior[item] = index + 1
-
-		max_index = len(prior) + 1
+	@cached_property
+	def translator_index(self):
+		return TranslatorIndex(self.translators, self._translators_priority, self._translators_non_priority)
 
-		for index, item in enumerate(non_priority if isinstance(non_priority, list) else self._translators_non_priority or []):
-			if not item in prior:
-				prior[item] = max_index + index + 1
+	def sort_translators(self, translators=None, priority=None, non_priority=None):
+		return self.translator_index.sort(translators or self.translators, priority=priority, non_priority=non_priority)
 
-		sorted_translators = dict(sorted(translators.items() or self.translators.items(), key=lambda item: prior.get(item[0], max_index)))
-		return sorted_translators
+	def _find_translator(self, translation):
+		return self.translator_index.resolve(translation)
 
 	@cached_property
 	def translators_names(self):
@@ -229,24 +311,7 @@ class HdRezkaApi():
 
 	@staticmethod
 	def clearTrash(data):
-		trashList = ["@","#","!","^","$"]
-		trashCodesSet = []
-		for i in range(2,4):
-			startchar = ''
-			for chars in product(trashList, repeat=i):
-				data_bytes = startchar.join(chars).encode("utf-8")
-				trashcombo = base64.b64encode(data_bytes)
-				trashCodesSet.append(trashcombo)
-
-		arr = data.replace("#h", "").split("//_//")
-		trashString = ''.join(arr)
-
-		for i in trashCodesSet:
-			temp = i.decode("utf-8")
-			trashString = trashString.replace(temp, '')
-
-		finalString = base64.b64decode(trashString+"==")
-		return finalString.decode("utf-8")
+		return clear_trash(data)
 
 	@cached_property
 	def otherParts(self):
@@ -265,9 +330,9 @@ class HdRezkaApi():
 		return other
 
 	@staticmethod
-	def getEpisodes(s, e):
-		seasons = BeautifulSoup(s, 'html.parser')
-		episodes = BeautifulSoup(e, 'html.parser')
+	def getEpisodes(s, e, parser=None):
+		seasons = make_soup(s, parser)
+		episodes = make_soup(e, parser)
 
 		seasons_ = {}
 		for season in seasons.findAll(class_="b-simple_season__item"):
@@ -282,168 +347,149 @@ class HdRezkaApi():
 
 		return seasons_, episodes_
 
+	def _cdn_series(self, data, timeout=None):
+		return self.egress.call(self, data, timeout or self.request_timeout, self.egress_exclude)
+
+	def translatorEpisodes(self, translator_id):
+		if self._has_episodes(translator_id): return self._episodes[translator_id]
+		response = self._cdn_series({
+			"id": self.id,
+			"translator_id": translator_id,
+			"action": "get_episodes"
+		})
+		return self._episodes_entry(translator_id, response)
+
+	def _has_episodes(self, translator_id):
+		if translator_id not in self._episodes and self.episodes_cache is not None:
+			entry = self.episodes_cache.get((self.id, translator_id))
+			if entry is not None: self._episodes[translator_id] = entry
+		return translator_id in self._episodes
+
+	def _episodes_entry(self, translator_id, response):
+		"""Parse a get_episodes response; failures are remembered per instance, successes also go to `episodes_cache`"""
+		entry = None
+		if response['success']:
+			tr_val = self.translators[translator_id]
+			seasons, episodes = self.getEpisodes(response['seasons'], response['episodes'], self.parser)
+			entry = {
+				"translator_name": tr_val["name"],
+				"premium": tr_val["premium"],
+				"seasons": seasons, "episodes": episodes
+			}
+			if self.episodes_cache is not None:
+				self.episodes_cache.set((self.id, translator_id), entry)
+		self._episodes[translator_id] = entry
+		return entry
+
 	@cached_property
 	def seriesInfo(self):
 		if self.type != TVSeries:
 			raise ValueError("The `seriesInfo` attribute is only available for TVSeries.")
-		arr = {}
-		for tr_id, tr_val in self.translators.items():
-			js = {
-				"id": self.id,
-				"translator_id": tr_id,
-				"action": "get_episodes"
-			}
+		self.id # resolve shared state before fanning out
+		translators = list(self.translators)
+		missing = [tr_id for tr_id in translators if not self._has_episodes(tr_id)]
+
+		errors = {}
+		def fetch(tr_id):
+			try: self.translatorEpisodes(tr_id)
+			except Exception as e: errors[tr_id] = e
+
+		workers = min(self.series_workers or 1, len(missing))
+		if workers > 1:
+			with ThreadPoolExecutor(max_workers=workers) as pool:
+				list(pool.map(fetch, missing))
+		else:
+			for tr_id in missing: fetch(tr_id)
+		return self._collect_series(translators, errors)
 
-			# Use Cloudflare Worker proxy if configured
-			if self.use_cloudflare_proxy and self.cloudflare_worker_url:
-				worker_response = requests.post(
-					self.cloudflare_worker_url,
-					json={
-						'url': f"{self.origin}/ajax/get_cdn_series/",
-						'data': js,
-						'headers': dict(self.HEADERS)
-					},
-					timeout=30
-				)
-				response = worker_response.json()
-			else:
-				r = requests.post(f"{self.origin}/ajax/get_cdn_series/", data=js, headers=self.HEADERS, proxies=self.proxy, cookies=self.cookies)
-				response = r.json()
-			if response['success']:
-				seasons, episodes = self.getEpisodes(response['seasons'], response['episodes'])
-				arr[tr_id] = {
-					"translator_name": tr_val["name"],
-					"premium": tr_val["premium"],
-					"seasons": seasons, "episodes": episodes
-				}
-		return arr
+	def _collect_series(self, translators, errors):
+		results = {tr_id: self._episodes.get(tr_id) for tr_id in translators}
+		self.seriesInfoErrors = errors
+		if errors and not any(results.values()):
+			raise next(iter(errors.values()))
+		return {tr_id: entry for tr_id, entry in results.items() if entry}
+
+	@cached_property
+	def availability(self):
+		"""Indexed season/episode/translator view of seriesInfo"""
+		if self.type != TVSeries:
+			raise ValueError("The `availability` attribute is only available for TVSeries.")
+		return EpisodeAvailability(self.seriesInfo)
 
 	@cached_property
 	def episodesInfo(self):
 		if self.type != TVSeries:
 			raise ValueError("The `episodesInfo` attribute is only available for TVSeries.")
-		output_data = []
-		for translator_id, translator_info in self.seriesInfo.items():
-			translator_name = translator_info["translator_name"]
-			premium = translator_info["premium"]
-			for season, season_text in translator_info["seasons"].items():
-				season_obj = next((s for s in output_data if s["season"] == int(season)), None)
-				if not season_obj:
-					season_obj = {
-						"season": int(season),
-						"season_text": season_text,
-						"episodes": []
-					}
-					output_data.append(season_obj)
-
-				for episode, episode_text in translator_info["episodes"].get(season, {}).items():
-					episode_obj = next((e for e in season_obj["episodes"] if e["episode"] == int(episode)), None)
-					if not episode_obj:
-						episode_obj = {
-							"episode": int(episode),
-							"episode_text": episode_text,
-							"translations": []
-						}
-						season_obj["episodes"].append(episode_obj)
-
-					episode_obj["translations"].append({
-						"translator_id": translator_id,
-						"translator_name": translator_name,
-						"premium": premium
-					})
-		return output_data
+		return self.availability.to_list()
 
 	def getStream(self, season=None, episode=None, translation=None,
 		priority=None, non_priority=None
 	):
-		def makeRequest(data):
-			# Use Cloudflare Worker proxy if configured
-			if self.use_cloudflare_proxy and self.cloudflare_worker_url:
-				print(f"[CLOUDFLARE_PROXY] Routing request through: {self.cloudflare_worker_url}")
-				worker_response = requests.post(
-					self.cloudflare_worker_url,
-					json={
-						'url': f"{self.origin}/ajax/get_cdn_series/",
-						'data': data,
-						'headers': dict(self.HEADERS)
-					},
-					timeout=30
-				)
-				r = worker_response.json()
-				print(f"[CLOUDFLARE_PROXY] Response received: success={r.get('success')}, has_url={bool(r.get('url'))}")
-			else:
-				r = requests.post(f"{self.origin}/ajax/get_cdn_series/", data=data, headers=self.HEADERS, proxies=self.proxy, cookies=self.cookies)
-				r = r.json()
-			if r['success'] and r['url']:
-				arr = self.clearTrash(r['url']).split(",")
-				stream = HdRezkaStream( season=season, episode=episode,
-										name=self.name, translator_id=data['translator_id'],
-										subtitles={'data': r['subtitle'], 'codes': r['subtitle_lns']}
-									)
-				for i in arr:
-					temp = i.split("[")[1].split("]")
-					quality = str(temp[0])
-					links = filter(lambda x: x.endswith(".mp4"), temp[1].split(" or "))
-					for video in links:
-						stream.append(quality, video)
-				return stream
-			raise FetchFailed()
-
-		def getStreamSeries(self, season, episode, translation_id):
-			return makeRequest({
-				"id": self.id,
-				"translator_id": translation_id,
-				"season": season,
-				"episode": episode,
-				"action": "get_stream"
-			})
-			
-
-		def getStreamMovie(self, translation_id):
-			return makeRequest({
-				"id": self.id,
-				"translator_id": translation_id,
-				"action": "get_movie"
-			})
-
-		def get_translator_id(translators):
-			translators_dict = {
-				translator['translator_id']: {
-					'name': translator['translator_name'],
-					'premium': translator['premium']
-				}
-				for translator in translators
-			}
+		data = self._stream_request(season, episode, translation, priority, non_priority)
+		return self._fetch_stream(data, season, episode)
 
-			if translation:
-				if str(translation).isnumeric():
-					if int(translation) in translators_dict:
-						return int(translation)
-					else:
-						raise ValueError(f'Translation with code "{translation}" is not defined')
+	def _fetch_stream(self, data, season=None, episode=None):
+		stream = self._cached_stream(data)
+		if stream is not None: return stream
+		r = self._cdn_series(data)
+		return self._store_stream(data, self._stream_response(data, r, season, episode))
 
-				elif any(d['translator_name'] == translation for d in translators):
-					return next((d['translator_id'] for d in translators if d['translator_name'] == translation), None)
-				else:
-					raise ValueError(f'Translation "{translation}" is not defined')
-			else:
-				return list(
-					self.sort_translators(translators_dict, priority=priority, non_priority=non_priority
-				).keys())[0]
+	@staticmethod
+	def _stream_key(data):
+		return (data['id'], data['translator_id'], data.get('season'), data.get('episode'))
+
+	def _cached_stream(self, data):
+		if self.stream_cache is not None: return self.stream_cache.get(self._stream_key(data))
+
+	def _store_stream(self, data, stream):
+		if self.stream_cache is not None: self.stream_cache.set(self._stream_key(data), stream)
+		return stream
 
+	def _stream_response(self, data, r, season=None, episode=None):
+		if r['success'] and r['url']:
+			return HdRezkaStream.parse(self.clearTrash(r['url']),
+				season=season, episode=episode,
+				name=self.name, translator_id=data['translator_id'],
+				subtitles={'data': r['subtitle'], 'codes': r['subtitle_lns']}
+			)
+		raise FetchFailed()
+
+	@staticmethod
+	def _has_episode(entry, season, episode):
+		return bool(entry) and int(episode) in entry['episodes'].get(int(season), {})
+
+	def _series_request(self, season, episode, translator_id):
+		return {
+			"id": self.id,
+			"translator_id": translator_id,
+			"season": int(season),
+			"episode": int(episode),
+			"action": "get_stream"
+		}
+
+	def _stream_request(self, season=None, episode=None, translation=None,
+		priority=None, non_priority=None
+	):
+		"""get_cdn_series form data for getStream; validates the arguments"""
+		index = self.translator_index
+		def get_translator_id(available=None):
+			if translation: return index.require(translation, available)
+			return index.best(available, priority=priority, non_priority=non_priority)
 
 		if self.type == TVSeries:
 			if season and episode:
-				episodes = next((s['episodes'] for s in self.episodesInfo if s['season'] == int(season)), None)
-				if not episodes:
+				if translation:
+					# check only the requested translator; the full graph is needed for priority selection
+					tr_id = self._find_translator(translation)
+					if tr_id is not None and self._has_episode(self.translatorEpisodes(tr_id), season, episode):
+						return self._series_request(season, episode, tr_id)
+
+				availability = self.availability
+				if not availability.seasons.get(int(season)):
 					raise ValueError(f'Season "{season}" is not found!')
-				
-				translators = next((e['translations'] for e in episodes if e['episode'] == int(episode)), None)
-				if not translators:
+				if not availability.has(season, episode):
 					raise ValueError(f'Episode "{episode}" in season "{season}" is not found!')
-
-				tr_id = get_translator_id(translators)
-				return getStreamSeries(self, int(season), int(episode), tr_id)
+				return self._series_request(season, episode, get_translator_id(availability.translators_for(season, episode)))
 			elif season and (not episode):
 				raise TypeError("getStream() missing one required argument (episode)")
 			elif episode and (not season):
@@ -451,77 +497,69 @@ class HdRezkaApi():
 			else:
 				raise TypeError("getStream() missing required arguments (season and episode)")
 		elif self.type == Movie:
-			translators = [{'translator_id': id, 'translator_name': details['name'], 'premium': details['premium']} for id, details in self.translators.items()]
-			tr_id = get_translator_id(translators)
-			return getStreamMovie(self, tr_id)
+			return {
+				"id": self.id,
+				"translator_id": get_translator_id(),
+				"action": "get_movie"
+			}
 		else:
 			raise TypeError("Undefined content type")
 
 
+	def _season_plan(self, season, translation=None, priority=None, non_priority=None):
+		"""(translator id, episode numbers) getSeasonStreams walks for a season"""
+		availability = self.availability
+		if not availability.seasons.get(int(season)): raise ValueError(f'Season "{season}" is not found!')
+
+		translators = availability.season_translators(season)
+		if translation:
+			tr_id = self.translator_index.require(translation, translators)
+		else:
+			tr_id = self.translator_index.best(translators, priority=priority, non_priority=non_priority)
+		return tr_id, availability.episodes(season, tr_id)
+
 	def getSeasonStreams(self, season, translation=None,
 		priority=None, non_priority=None,
-		ignore=False, progress=None
+		ignore=False, progress=None, workers=None
 	):
+		"""Yield (episode, stream) in episode order while up to `workers` (default series_workers) episodes resolve concurrently"""
 		if not progress: progress = lambda cur, all: None
-		streams = {}
-
-		def get_episodes_by_translator(data):
-			result = {}
-			for item in data:
-				episode = item['episode']
-				for translation in item['translations']:
-					translator_id = translation['translator_id']
-					translator_name = translation['translator_name']
-					if translator_id not in result:
-						result[translator_id] = {'translator_name': translator_name, 'episodes': []}
-					result[translator_id]['episodes'].append(episode)
-			return result
-
-		def get_translator_id(translators):
-			if translation:
-				if str(translation).isnumeric():
-					if int(translation) in translators.keys():
-						return int(translation)
-					else:
-						raise ValueError(f'Translation with code "{translation}" is not defined')
-
-				elif any(v['translator_name'] == translation for k, v in translators.items()):
-					return next((k for k, v in translators.items() if v['translator_name'] == translation), None)
-				else:
-					raise ValueError(f'Translation "{translation}" is not defined')
-			else:
-				return list(
-					self.sort_translators(translators, priority=priority, non_priority=non_priority
-				).keys())[0]
-
-		episodes = next((s['episodes'] for s in self.episodesInfo if s['season'] == int(season)), None)
-		if not episodes: raise ValueError(f'Season "{season}" is not found!')
-
-		episodes_data = get_episodes_by_translator(episodes)
-		tr_id = get_translator_id(episodes_data)
-		series = episodes_data[tr_id]['episodes']
+		tr_id, series = self._season_plan(season, translation, priority, non_priority)
 		series_length = len(series)
 		progress(0, series_length)
-
-		def make_call(episode, retry=True):
-			try:
-				stream = self.getStream(season, episode, tr_id)
-				streams[episode] = stream
-				progress(len(streams), series_length)
-				return stream
-			except Exception as e:
-				if retry:
-					time.sleep(1)
-					if ignore:
-						return make_call(episode)
-					else:
-						return make_call(episode, retry=False)
-				if not ignore:
-					ex_name = e.__class__.__name__
-					ex_desc = e
-					print(f"{ex_name} > ep:{episode}: {ex_desc}")
-					streams[episode] = None
-					progress(len(streams), series_length)
-
-		for episode in series:
-			yield episode, make_call(episode)
+		done = []
+		lock = threading.Lock()
+		stopped = threading.Event() # set when the generator is closed: running calls stop retrying
+
+		def finished():
+			with lock:
+				done.append(True)
+				progress(len(done), series_length)
+
+		def make_call(episode):
+			# the translator is validated once above; episodes go straight to get_cdn_series
+			data = self._series_request(season, episode, tr_id)
+			attempt = 0
+			while not stopped.is_set():
+				try:
+					stream = self._fetch_stream(data, season, episode)
+					finished()
+					return stream
+				except Exception as e:
+					# ignore=True retries until it succeeds, otherwise one retry and the episode yields None
+					if ignore or attempt == 0:
+						if stopped.wait(backoff_delay(attempt, base=1)): return None
+						attempt += 1
+						continue
+					print(f"{e.__class__.__name__} > ep:{episode}: {e}")
+					finished()
+					return None
+
+		pool = ThreadPoolExecutor(max_workers=max(1, min(workers or self.series_workers or 1, series_length or 1)))
+		try:
+			futures = [pool.submit(make_call, episode) for episode in series]
+			for episode, future in zip(series, futures):
+				yield episode, future.result()
+		finally:
+			stopped.set()
+			pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,81 @@
+class EpisodeAvailability:
+	"""season -> episode -> bitset over translator ordinals (page order), built once from seriesInfo"""
+	__slots__ = ("translators", "ordinals", "names", "premium", "seasons", "season_text", "episode_text")
+
+	def __init__(self, series_info):
+		self.translators = list(series_info) # ordinal -> translator id
+		self.ordinals = {tr_id: i for i, tr_id in enumerate(self.translators)}
+		self.names = [series_info[tr_id]["translator_name"] for tr_id in self.translators]
+		self.premium = [series_info[tr_id]["premium"] for tr_id in self.translators]
+		self.seasons = {} # season -> {episode: mask}, both in first-seen order like episodesInfo
+		self.season_text = {}
+		self.episode_text = {}
+		for i, tr_id in enumerate(self.translators):
+			bit = 1 << i
+			entry = series_info[tr_id]
+			for season, season_text in entry["seasons"].items():
+				s = int(season)
+				self.season_text.setdefault(s, season_text)
+				episodes = self.seasons.setdefault(s, {})
+				for episode, episode_text in entry["episodes"].get(season, {}).items():
+					e = int(episode)
+					episodes[e] = episodes.get(e, 0) | bit
+					self.episode_text.setdefault((s, e), episode_text)
+
+	def __contains__(self, key):
+		return self.has(*key)
+
+	def mask(self, season, episode):
+		return self.seasons.get(int(season), {}).get(int(episode), 0)
+
+	def has(self, season, episode, translator_id=None):
+		mask = self.mask(season, episode)
+		if translator_id is None: return mask != 0
+		ordinal = self.ordinals.get(translator_id)
+		return ordinal is not None and bool(mask >> ordinal & 1)
+
+	def _ids(self, mask):
+		ids = []
+		while mask:
+			low = mask & -mask
+			ids.append(self.translators[low.bit_length() - 1])
+			mask ^= low
+		return ids
+
+	def translators_for(self, season, episode):
+		"""Translator ids of an episode, in page order"""
+		return self._ids(self.mask(season, episode))
+
+	def season_translators(self, season):
+		"""Translator ids with episodes in the season, in order of first appearance (as the episodesInfo scan sees them)"""
+		seen, order = 0, []
+		for mask in self.seasons.get(int(season), {}).values():
+			new = mask & ~seen
+			if new:
+				order.extend(self._ids(new))
+				seen |= new
+		return order
+
+	def episodes(self, season, translator_id=None):
+		episodes = self.seasons.get(int(season), {})
+		if translator_id is None: return list(episodes)
+		ordinal = self.ordinals.get(translator_id)
+		if ordinal is None: return []
+		bit = 1 << ordinal
+		return [e for e, mask in episodes.items() if mask & bit]
+
+	def translation(self, translator_id):
+		i = self.ordinals[translator_id]
+		return {"translator_id": translator_id, "translator_name": self.names[i], "premium": self.premium[i]}
+
+	def to_list(self):
+		"""The episodesInfo list of dicts"""
+		return [{
+			"season": s,
+			"season_text": self.season_text[s],
+			"episodes": [{
+				"episode": e,
+				"episode_text": self.episode_text[(s, e)],
+				"translations": [self.translation(tr_id) for tr_id in self._ids(mask)]
+			} for e, mask in episodes.items()]
+		} for s, episodes in self.seasons.items()]
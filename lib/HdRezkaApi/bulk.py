@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .stream import HdRezkaStream
+from .transport import backoff_delay
+
+
+class StreamCheckpoint:
+	"""Append-only JSON-lines store of resolved streams, so an interrupted bulk job can resume"""
+	def __init__(self, path):
+		self.path = path
+		self._lock = threading.Lock()
+
+	def load(self, post_id, translator_id, max_age=None):
+		"""{(season, episode): HdRezkaStream} recorded for this title and translator"""
+		streams = {}
+		if not os.path.exists(self.path): return streams
+		now = time.time()
+		with open(self.path, encoding="utf-8") as f:
+			for line in f:
+				try: record = json.loads(line)
+				except ValueError: continue # torn last line of a killed job
+				if record.get("id") != post_id or record.get("translator_id") != translator_id: continue
+				if max_age is not None and now - record.get("resolved_at", 0) > max_age: continue
+				streams[(record["season"], record["episode"])] = HdRezkaStream.from_dict(record["stream"])
+		return streams
+
+	def add(self, post_id, translator_id, season, episode, stream):
+		line = json.dumps({
+			"id": post_id, "translator_id": translator_id,
+			"season": season, "episode": episode,
+			"resolved_at": time.time(), "stream": stream.to_dict()
+		}, ensure_ascii=False)
+		with self._lock:
+			with open(self.path, "a", encoding="utf-8") as f:
+				f.write(line + "\n")
+				f.flush()
+				os.fsync(f.fileno())
+
+
+class BulkStats:
+	"""Live counters of a BulkResolver run; safe to read from another thread"""
+	def __init__(self):
+		self._lock = threading.Lock()
+		self.total = 0
+		self.resumed = 0
+		self.resolved = 0
+		self.failures = 0
+		self.retries = 0
+		self.started = None
+		self.finished = None
+
+	def add(self, counter, n=1):
+		with self._lock: setattr(self, counter, getattr(self, counter) + n)
+
+	@property
+	def elapsed(self):
+		if self.started is None: return 0.0
+		return (self.finished or time.monotonic()) - self.started
+
+	@property
+	def episodes_per_sec(self):
+		return self.resolved / self.elapsed if self.elapsed else 0.0
+
+	def as_dict(self):
+		return {
+			"total": self.total, "resumed": self.resumed, "resolved": self.resolved,
+			"failures": self.failures, "retries": self.retries,
+			"elapsed": round(self.elapsed, 3), "episodes_per_sec": round(self.episodes_per_sec, 2)
+		}
+
+	def __str__(self):
+		return (f"BulkStats({self.resolved + self.resumed}/{self.total} episodes, {self.resumed} resumed, "
+			f"{self.failures} failed, {self.retries} retries, {self.episodes_per_sec:.2f} ep/s)")
+	def __repr__(self): return str(self)
+
+
+class BulkResolver:
+	"""Resolve every season and episode of a series for one translator"""
+	def __init__(self, rezka, translation=None, priority=None, non_priority=None,
+		workers=None, retries=3, checkpoint=None, max_age=None
+	):
+		self.rezka = rezka
+		self.translation = translation
+		self.priority = priority
+		self.non_priority = non_priority
+		self.workers = workers or rezka.series_workers or 1
+		self.retries = retries
+		if isinstance(checkpoint, (str, os.PathLike)): checkpoint = StreamCheckpoint(checkpoint)
+		self.checkpoint = checkpoint
+		self.max_age = max_age
+		self.stats = BulkStats()
+		self.errors = {}
+
+	def translator_id(self):
+		index = self.rezka.translator_index
+		if self.translation: return index.require(self.translation)
+		return index.best(self.rezka.seriesInfo, priority=self.priority, non_priority=self.non_priority)
+
+	def plan(self, translator_id):
+		"""[(season, episode)] of the translator, in order"""
+		entry = self.rezka.translatorEpisodes(translator_id)
+		if not entry: raise ValueError(f'No episodes for translation "{translator_id}"')
+		return [(season, episode) for season in sorted(entry["episodes"]) for episode in sorted(entry["episodes"][season])]
+
+	def run(self, progress=None):
+		"""{(season, episode): HdRezkaStream}; episodes that still fail after `retries` are left out and listed in `errors`"""
+		if not progress: progress = lambda cur, all: None
+		rezka = self.rezka
+		tr_id = self.translator_id()
+		episodes = self.plan(tr_id)
+		streams = {}
+		if self.checkpoint:
+			done = self.checkpoint.load(rezka.id, tr_id, self.max_age)
+			streams = {key: done[key] for key in episodes if key in done}
+
+		stats = self.stats = BulkStats()
+		stats.total = len(episodes)
+		stats.resumed = len(streams)
+		stats.started = time.monotonic()
+		self.errors = {}
+		progress(len(streams), len(episodes))
+
+		def resolve(season, episode):
+			data = rezka._series_request(season, episode, tr_id)
+			for attempt in range(self.retries + 1):
+				if attempt:
+					stats.add("retries")
+					time.sleep(backoff_delay(attempt - 1, base=1))
+				try: return rezka._fetch_stream(data, season, episode)
+				except Exception as e: error = e
+			raise error
+
+		todo = [key for key in episodes if key not in streams]
+		with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(todo) or 1))) as pool:
+			futures = {pool.submit(resolve, *key): key for key in todo}
+			for future in as_completed(futures):
+				key = futures[future]
+				try:
+					stream = future.result()
+				except Exception as e:
+					stats.add("failures")
+					self.errors[key] = e
+				else:
+					streams[key] = stream
+					stats.add("resolved")
+					if self.checkpoint: self.checkpoint.add(rezka.id, tr_id, *key, stream)
+				progress(len(streams) + len(self.errors), len(episodes))
+		stats.finished = time.monotonic()
+		return {key: streams[key] for key in episodes if key in streams}
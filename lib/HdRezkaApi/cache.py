@@ -0,0 +1,176 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+
+class TTLCache:
+	"""Thread-safe LRU cache with per-entry expiry and an approximate memory bound"""
+	def __init__(self, ttl=600, maxsize=1024, max_bytes=None):
+		self.ttl = ttl
+		self.maxsize = maxsize
+		self.max_bytes = max_bytes
+		self._data = OrderedDict() # key -> (expires, size, value)
+		self._bytes = 0
+		self._lock = threading.Lock()
+
+	def __len__(self): return len(self._data)
+	def __contains__(self, key): return self.get(key) is not None
+	def __repr__(self): return f"<TTLCache({len(self)}/{self.maxsize})>"
+
+	@staticmethod
+	def sizeof(value):
+		return len(json.dumps(value, ensure_ascii=False, default=str))
+
+	def get(self, key, default=None):
+		with self._lock:
+			entry = self._data.get(key)
+			if entry is None: return default
+			if entry[0] <= time.monotonic():
+				self._remove(key)
+				return default
+			self._data.move_to_end(key)
+			return entry[2]
+
+	def set(self, key, value, ttl=None):
+		size = self.sizeof(value) if self.max_bytes else 0
+		if self.max_bytes and size > self.max_bytes: return
+		expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+		with self._lock:
+			if key in self._data: self._remove(key)
+			self._data[key] = (expires, size, value)
+			self._bytes += size
+			while len(self._data) > self.maxsize or (self.max_bytes and self._bytes > self.max_bytes):
+				self._remove(next(iter(self._data)))
+
+	def get_or_load(self, key, loader):
+		value = self.get(key)
+		if value is None:
+			value = loader()
+			if value is not None: self.set(key, value)
+		return value
+
+	def delete(self, key):
+		with self._lock:
+			if key in self._data: self._remove(key)
+
+	def clear(self):
+		with self._lock:
+			self._data.clear()
+			self._bytes = 0
+
+	def _remove(self, key):
+		self._bytes -= self._data.pop(key)[1]
+
+
+class SWRCache(TTLCache):
+	"""Stale-while-revalidate: get_or_load serves entries up to `max_stale` seconds past their TTL and refreshes them in the background"""
+	def __init__(self, ttl=600, max_stale=3600, maxsize=1024, max_bytes=None, workers=2):
+		super().__init__(ttl=ttl, maxsize=maxsize, max_bytes=max_bytes)
+		self.max_stale = max_stale
+		self.workers = workers
+		self.metrics = {"hits": 0, "misses": 0, "stale_served": 0, "refreshed": 0, "refresh_errors": 0}
+		self._refreshing = set()
+		self._pool = None
+
+	def __repr__(self): return f"<SWRCache({len(self)}/{self.maxsize}) {self.metrics}>"
+
+	def _count(self, name):
+		with self._lock: self.metrics[name] += 1
+
+	def _lookup(self, key):
+		entry = super().get(key)
+		if entry is None: return None, False
+		return entry[1], entry[0] > time.monotonic()
+
+	def get(self, key, default=None):
+		"""Fresh entries only, like TTLCache.get"""
+		value, fresh = self._lookup(key)
+		return value if fresh else default
+
+	def set(self, key, value, ttl=None):
+		ttl = self.ttl if ttl is None else ttl
+		# kept past its TTL for the stale window; the hard bound is the underlying expiry
+		super().set(key, (time.monotonic() + ttl, value), ttl + self.max_stale)
+
+	def get_or_load(self, key, loader):
+		value, fresh = self._lookup(key)
+		if value is not None:
+			if fresh:
+				self._count("hits")
+			else:
+				self._count("stale_served")
+				self._refresh(key, loader)
+			return value
+		self._count("misses")
+		value = loader()
+		if value is not None: self.set(key, value)
+		return value
+
+	def _refresh(self, key, loader):
+		with self._lock:
+			if key in self._refreshing: return
+			self._refreshing.add(key)
+			if self._pool is None:
+				self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="swr-refresh")
+		self._pool.submit(self._run_refresh, key, loader)
+
+	def _run_refresh(self, key, loader):
+		try:
+			value = loader()
+			if value is not None: self.set(key, value)
+			self._count("refreshed")
+		except Exception:
+			self._count("refresh_errors") # the stale entry keeps being served until max_stale
+		finally:
+			with self._lock: self._refreshing.discard(key)
+
+
+# signed CDN links carry their lifetime, either as "?expires=<unix time>" or as a
+# ":YYYYMMDDHH:" token in the path (".../s__/<hash>:2025101712:<sig>/720p.mp4")
+_query_expiry = re.compile(r'[?&]expires=(\d{9,11})\b')
+_token_expiry = re.compile(r':(\d{10}):')
+# the path token is in the site's local time (Moscow); reading it as UTC+3 errs on the early side
+token_timezone = timezone(timedelta(hours=3))
+
+def url_expiry(url):
+	"""Unix time a signed stream link stops working, or None when it carries no expiry"""
+	match = _query_expiry.search(url)
+	if match: return int(match.group(1))
+	match = _token_expiry.search(url)
+	if match:
+		try: return datetime.strptime(match.group(1), "%Y%m%d%H").replace(tzinfo=token_timezone).timestamp()
+		except ValueError: return None
+
+
+class StreamCache(TTLCache):
+	"""Parsed HdRezkaStreams by (post id, translator id, season, episode), kept until the first link expires"""
+	def __init__(self, ttl=300, maxsize=4096, margin=300, max_ttl=6 * 3600):
+		super().__init__(ttl=ttl, maxsize=maxsize)
+		self.margin = margin
+		self.max_ttl = max_ttl
+
+	def stream_ttl(self, stream):
+		"""Seconds until the earliest link expires minus `margin`; `ttl` when no link is signed"""
+		expiries = [expiry for links in stream.videos.values() for url in links if (expiry := url_expiry(url)) is not None]
+		if not expiries: return self.ttl
+		return min(min(expiries) - time.time() - self.margin, self.max_ttl)
+
+	def set(self, key, value, ttl=None):
+		if ttl is None: ttl = self.stream_ttl(value)
+		if ttl > 0: super().set(key, value, ttl)
+
+
+# parsed title page fields (id, names, translators, type, rating, thumbnail) by (origin, post id)
+default_title_cache = SWRCache(ttl=600, max_stale=3600, maxsize=2048, max_bytes=16 * 1024 * 1024)
+# get_episodes results by (post id, translator id); short-lived so new episodes show up
+default_episodes_cache = TTLCache(ttl=300, maxsize=8192, max_bytes=32 * 1024 * 1024)
+# search.php results by ("fast", origin, normalized query)
+default_search_cache = SWRCache(ttl=300, max_stale=1800, maxsize=4096, max_bytes=8 * 1024 * 1024)
+# /search/ result pages by ("page", origin, normalized query, page); kept apart so big pages do not evict fast results
+default_search_pages_cache = SWRCache(ttl=300, max_stale=1800, maxsize=2048, max_bytes=16 * 1024 * 1024)
+# resolved streams; expiry follows the signed CDN links
+default_stream_cache = StreamCache()
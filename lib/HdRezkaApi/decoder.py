@@ -0,0 +1,35 @@
+import base64
+import re
+from itertools import product
+
+trash_chars = ["@","#","!","^","$"]
+
+# base64 of every 2- and 3-char combination of trash_chars, built once at import
+trash_tokens = tuple(
+	base64.b64encode("".join(chars).encode("utf-8")).decode("utf-8")
+	for i in range(2,4) for chars in product(trash_chars, repeat=i)
+)
+
+def _trie_pattern(words):
+	# prefix trie rendered as nested groups, so the regex engine never backtracks across tokens
+	trie = {}
+	for word in words:
+		node = trie
+		for char in word: node = node.setdefault(char, {})
+		node[""] = {}
+	def render(node):
+		branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+		if not branches: return ""
+		if all(len(b) == 1 for b in branches) and "" not in node:
+			return branches[0] if len(branches) == 1 else "[" + "".join(branches) + "]"
+		if "" in node: branches.append("")
+		return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+	return render(trie)
+
+trash_pattern = re.compile(_trie_pattern(trash_tokens))
+
+
+def clear_trash(data):
+	"""Decode an obfuscated `#h...` stream payload returned by get_cdn_series"""
+	payload = trash_pattern.sub("", data.replace("#h", "").replace("//_//", ""))
+	return base64.b64decode(payload+"==").decode("utf-8")
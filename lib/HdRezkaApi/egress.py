@@ -0,0 +1,314 @@
+import os
+import threading
+import time
+from collections import deque
+from .errors import RateLimited
+
+
+STREAM_ACTIONS = ("get_stream", "get_movie")
+
+def action_class(data):
+	"""Health is kept per class: a datacenter IP is soft-blocked on streams while get_episodes still works"""
+	return "stream" if data.get("action") in STREAM_ACTIONS else "other"
+
+def blocked(response):
+	"""The site's soft block: `success: true, url: false` for a stream request"""
+	return isinstance(response, dict) and bool(response.get("success")) and response.get("url") is False
+
+
+class RouteHealth:
+	"""Rolling success rate and latency of a route (last `window` calls within `horizon` seconds), with a circuit breaker"""
+	def __init__(self, window=20, failure_threshold=3, cooldown=60, horizon=600):
+		self.outcomes = deque(maxlen=window) # (at, ok, seconds)
+		self.horizon = horizon
+		self.failure_threshold = failure_threshold
+		self.cooldown = cooldown
+		self.consecutive_failures = 0
+		self.open_until = 0.0
+		self.last_failure = float("-inf")
+		self.trial = False # half-open: one call is let through after the cooldown
+		self._lock = threading.Lock()
+
+	def __repr__(self): return f"<RouteHealth({self.success_rate:.0%}, {self.latency * 1e3:.0f} ms, {self.state})>"
+
+	def _recent(self):
+		# old outcomes expire so a demoted route is eventually tried again
+		since = time.monotonic() - self.horizon
+		with self._lock: return [(ok, seconds) for at, ok, seconds in self.outcomes if at >= since]
+
+	@property
+	def success_rate(self):
+		outcomes = self._recent()
+		if not outcomes: return 1.0
+		return sum(1 for ok, _ in outcomes if ok) / len(outcomes)
+
+	@property
+	def latency(self):
+		times = [seconds for ok, seconds in self._recent() if ok]
+		return sum(times) / len(times) if times else 0.0
+
+	@property
+	def state(self):
+		if not self.open_until: return "closed"
+		return "open" if time.monotonic() < self.open_until else "half-open"
+
+	def demoted(self, min_success, min_samples=3):
+		"""Closed but failing too often: ranked after healthy routes until `cooldown` has passed since the last failure"""
+		outcomes = self._recent()
+		if self.open_until or len(outcomes) < min_samples: return False
+		if time.monotonic() - self.last_failure >= self.cooldown: return False
+		return sum(1 for ok, _ in outcomes if ok) / len(outcomes) < min_success
+
+	def available(self):
+		return not self.open_until or (time.monotonic() >= self.open_until and not self.trial)
+
+	def allow(self):
+		"""Whether a call may use the route now; takes the single half-open trial"""
+		with self._lock:
+			if not self.open_until: return True
+			if time.monotonic() < self.open_until or self.trial: return False
+			self.trial = True
+			return True
+
+	def release(self):
+		"""Give the half-open trial back when a call ended without an outcome (cancelled, interrupted)"""
+		with self._lock: self.trial = False
+
+	def record(self, ok, seconds=0.0):
+		"""Returns True when this outcome opened the breaker"""
+		with self._lock:
+			if ok and self.open_until: self.outcomes.clear() # recovered: the failures before the trial are history
+			self.outcomes.append((time.monotonic(), ok, seconds))
+			self.trial = False
+			if ok:
+				self.consecutive_failures = 0
+				self.open_until = 0.0
+				return False
+			self.consecutive_failures += 1
+			self.last_failure = time.monotonic()
+			if self.open_until or self.consecutive_failures >= self.failure_threshold:
+				self.open_until = time.monotonic() + self.cooldown
+				return True
+			return False
+
+
+class Route:
+	"""A way of sending get_cdn_series; lower `cost` is tried first"""
+	name = "route"
+	cost = 0
+	actions = None # get_cdn_series actions it can serve, None for all
+
+	def handles(self, data):
+		return self.actions is None or data.get("action") in self.actions
+
+	def request(self, rezka, data, timeout=None):
+		"""(url, keyword arguments) of the HTTP call, or None when the route is not plain HTTP"""
+		return None
+
+	def send(self, rezka, data, timeout=None):
+		url, kwargs = self.request(rezka, data, timeout)
+		return rezka.transport.post(url, **kwargs).json()
+
+
+class DirectRoute(Route):
+	"""Straight to the site from this host"""
+	name = "direct"
+	cost = 0
+
+	def request(self, rezka, data, timeout=None):
+		kwargs = {"timeout": timeout} if timeout else {}
+		return f"{rezka.origin}/ajax/get_cdn_series/", {"data": data, "headers": rezka.HEADERS, "proxies": rezka.proxy, "cookies": rezka.cookies, **kwargs}
+
+
+class WorkerRoute(Route):
+	"""Relayed by the Cloudflare Worker (CLOUDFLARE_WORKER_URL) from Cloudflare's network"""
+	name = "worker"
+	cost = 1
+
+	def __init__(self, url):
+		self.url = url
+
+	def request(self, rezka, data, timeout=None):
+		return self.url, {
+			"json": {
+				'url': f"{rezka.origin}/ajax/get_cdn_series/",
+				'data': data,
+				'headers': dict(rezka.HEADERS)
+			},
+			"timeout": timeout or 30
+		}
+
+
+class CallableRoute(Route):
+	"""Route backed by a function (rezka, data, timeout) -> get_cdn_series response, e.g. a headless browser"""
+	def __init__(self, name, fetch, cost=2, actions=STREAM_ACTIONS):
+		self.name = name
+		self.fetch = fetch
+		self.cost = cost
+		self.actions = actions
+
+	def send(self, rezka, data, timeout=None):
+		return self.fetch(rezka, data, timeout)
+
+
+class EgressRouter:
+	"""
+	Sends get_cdn_series over the best healthy route: routes with an open breaker are
+	skipped, healthy ones go before unhealthy ones, then by cost and latency; a failed
+	or blocked call falls through to the next route. When every breaker is open the
+	routes are still tried in cost order. Health is tracked per (route, action class);
+	a route needs `min_samples` recent calls before its success rate can demote it.
+	"""
+	classes = ("stream", "other")
+
+	def __init__(self, routes=(), window=20, failure_threshold=3, cooldown=60, min_success=0.5, min_samples=3):
+		self.window = window
+		self.failure_threshold = failure_threshold
+		self.cooldown = cooldown
+		self.min_success = min_success
+		self.min_samples = min_samples
+		self.routes = []
+		self.health = {} # (route name, action class) -> RouteHealth
+		self._lock = threading.Lock()
+		for route in routes: self.register(route)
+
+	def __repr__(self): return f"<EgressRouter {self.snapshot()}>"
+
+	def register(self, route):
+		with self._lock:
+			self.routes = sorted([r for r in self.routes if r.name != route.name] + [route], key=lambda r: r.cost)
+			for kind in self.classes:
+				self.health[(route.name, kind)] = RouteHealth(self.window, self.failure_threshold, self.cooldown)
+		return route
+
+	def unregister(self, name):
+		with self._lock:
+			self.routes = [r for r in self.routes if r.name != name]
+			for kind in self.classes: self.health.pop((name, kind), None)
+
+	def route_health(self, route, data):
+		return self.health[(route.name, action_class(data))]
+
+	def plan(self, data, exclude=()):
+		"""Routes to try for `data`, best first; a half-open route is probed in cost order"""
+		candidates = []
+		for route in self.routes:
+			if route.name in exclude or not route.handles(data): continue
+			health = self.route_health(route, data)
+			if not health.available(): continue
+			unhealthy = health.demoted(self.min_success, self.min_samples)
+			candidates.append((unhealthy, route.cost, health.latency, route))
+		candidates.sort(key=lambda c: c[:3])
+		return [c[3] for c in candidates]
+
+	def last_resort(self, data, exclude=()):
+		"""Every route for `data` in cost order, for when all breakers are open: failing slowly beats not trying"""
+		return [route for route in self.routes if route.name not in exclude and route.handles(data)]
+
+	def allow(self, route, data):
+		return self.route_health(route, data).allow()
+
+	def release(self, route, data):
+		self.route_health(route, data).release()
+
+	def record(self, route, data, response=None, error=None, seconds=0.0):
+		"""Feed an outcome back; returns whether it counts as a success"""
+		ok = error is None and not (data.get("action") in STREAM_ACTIONS and blocked(response))
+		if self.route_health(route, data).record(ok, seconds):
+			print(f"[EGRESS] {route.name} disabled for {action_class(data)} calls for {self.cooldown}s after repeated failures")
+		return ok
+
+	def dispatch(self, data, exclude=()):
+		return Dispatch(self, data, exclude)
+
+	def call(self, rezka, data, timeout=None, exclude=()):
+		"""get_cdn_series response from the first route that succeeds"""
+		dispatch = self.dispatch(data, exclude)
+		try:
+			for route in dispatch:
+				try: dispatch.done(route.send(rezka, data, timeout))
+				except Exception as e: dispatch.failed(e)
+		finally: dispatch.close()
+		return dispatch.result()
+
+	def snapshot(self):
+		return {
+			route.name: {"cost": route.cost, **{kind: {
+				"success_rate": round(h.success_rate, 3), "latency_ms": round(h.latency * 1e3, 1), "state": h.state
+			} for kind in self.classes for h in [self.health[(route.name, kind)]]}}
+			for route in self.routes
+		}
+
+
+class Dispatch:
+	"""
+	One get_cdn_series call walking the router's plan. Iterating yields the routes to
+	try; the client sends over each and reports done(response) or failed(error), which
+	records the outcome and ends the iteration on success. close() must follow, also when
+	the call is abandoned, so a half-open trial without an outcome is given back.
+	Shared by the sync and async clients.
+	"""
+	def __init__(self, router, data, exclude=()):
+		self.router = router
+		self.data = data
+		self.exclude = exclude
+		self.response = None
+		self.error = None
+		self.ok = False
+		self._route = None
+		self._pending = False # _route was handed out and has no outcome yet
+		self._start = 0.0
+
+	def __iter__(self):
+		router, data = self.router, self.data
+		routes = router.plan(data, self.exclude)
+		forced = not routes
+		for route in routes or router.last_resort(data, self.exclude):
+			if not forced and not router.allow(route, data): continue
+			self._route, self._pending, self._start = route, True, time.monotonic()
+			try: yield route
+			finally: self.close()
+			if self.ok: return
+
+	def done(self, response):
+		self._finish(response, None)
+
+	def failed(self, error):
+		if isinstance(error, RateLimited):
+			# shed by our own limiter: nothing is learned about the route and the next one has its own bucket
+			self.close()
+			self.response, self.error = None, error
+			return
+		self._finish(None, error)
+
+	def close(self):
+		if self._pending:
+			self._pending = False
+			self.router.release(self._route, self.data)
+
+	def _finish(self, response, error):
+		self._pending = False
+		self.response, self.error = response, error
+		self.ok = self.router.record(self._route, self.data, response, error, time.monotonic() - self._start)
+		if not self.ok: print(f"[EGRESS] {self._route.name} failed for {self.data.get('action')}: {error or 'blocked'}")
+
+	def result(self):
+		if self.ok: return self.response
+		if self.error is not None: raise self.error
+		if self.response is None: raise ConnectionError("No egress route available for get_cdn_series")
+		return self.response # blocked on every route; the caller reports it
+
+
+_default_egress = None
+_default_egress_lock = threading.Lock()
+
+def default_egress():
+	"""Process-wide router: direct, plus the Cloudflare Worker when CLOUDFLARE_WORKER_URL is set"""
+	global _default_egress
+	with _default_egress_lock:
+		if _default_egress is None:
+			routes = [DirectRoute()]
+			worker_url = os.getenv('CLOUDFLARE_WORKER_URL', '')
+			if worker_url: routes.append(WorkerRoute(worker_url))
+			_default_egress = EgressRouter(routes)
+		return _default_egress
@@ -10,5 +10,10 @@ class FetchFailed(Exception):
 class CaptchaError(Exception):
 	def __init__(self): super().__init__("Failed to bypass captcha!")
 
+class RateLimited(Exception):
+	def __init__(self, wait):
+		super().__init__(f"Upstream rate limit: no request slot for {wait:.1f}s")
+		self.wait = wait
+
 class HTTP(Exception):
 	def __init__(self, code, message=""): super().__init__(f"{code}: {message}")
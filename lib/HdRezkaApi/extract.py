@@ -0,0 +1,142 @@
+from html.parser import HTMLParser
+import re
+
+_year = re.compile(r'\d{4}')
+
+
+class _Region:
+	__slots__ = ("tag", "depth", "name", "text", "data")
+	def __init__(self, tag, name, text=False, data=None):
+		self.tag = tag
+		self.depth = 1
+		self.name = name
+		self.text = [] if text else None
+		self.data = data
+
+
+class TitlePageParser(HTMLParser):
+	"""Single pass over a title page collecting the fields HdRezkaApi reads from it"""
+	def __init__(self):
+		super().__init__(convert_charrefs=True)
+		self.fields = {}
+		self.ids = {}
+		self.translators = {}
+		self.regions = []
+		self.seen = set()
+
+	def enter(self, tag, name, text=False, data=None, once=True):
+		if once:
+			if name in self.seen: return
+			self.seen.add(name)
+		self.regions.append(_Region(tag, name, text, data))
+
+	def inside(self, name):
+		return any(region.name == name for region in self.regions)
+
+	def handle_starttag(self, tag, attrs):
+		for region in self.regions:
+			if region.tag == tag: region.depth += 1
+		self.element(tag, dict(attrs))
+
+	def handle_startendtag(self, tag, attrs):
+		self.element(tag, dict(attrs))
+
+	def element(self, tag, attrs):
+		classes = (attrs.get("class") or "").split()
+		id = attrs.get("id")
+		if tag == "title":
+			self.enter(tag, "title", text=True)
+		elif tag == "meta" and attrs.get("property") == "og:type":
+			self.fields.setdefault("type", attrs.get("content"))
+		elif id == "post_id":
+			self.ids.setdefault("post_id", attrs.get("value"))
+		elif id == "send-video-issue":
+			self.ids.setdefault("send-video-issue", attrs.get("data-id"))
+		elif id == "user-favorites-holder":
+			self.ids.setdefault("user-favorites-holder", attrs.get("data-post_id"))
+		elif id == "translators-list":
+			self.enter(tag, "translators")
+
+		if "b-post__title" in classes: self.enter(tag, "names", text=True)
+		elif "b-post__origtitle" in classes: self.enter(tag, "origNames", text=True)
+		elif "b-post__description_text" in classes: self.enter(tag, "description", text=True)
+		elif "b-sidecover" in classes: self.enter(tag, "sidecover")
+		elif "b-post__rating" in classes:
+			self.enter(tag, "rating")
+			self.fields["rating"] = [None, None]
+		elif "b-content__main" in classes: self.enter(tag, "main")
+		elif "b-post__info" in classes and self.inside("main"): self.enter(tag, "info", once=False)
+
+		if self.inside("sidecover"):
+			if tag == "img" and "thumbnail" not in self.fields: self.fields["thumbnail"] = attrs.get("src")
+			if tag == "a" and "thumbnailHQ" not in self.fields: self.fields["thumbnailHQ"] = attrs.get("href")
+		if self.inside("rating"):
+			if "num" in classes: self.enter(tag, "rating_num", text=True)
+			elif "votes" in classes: self.enter(tag, "rating_votes", text=True)
+		if self.inside("info") and tag == "a" and "releaseYear" not in self.fields:
+			match = _year.search(attrs.get("href") or "") if "/year/" in (attrs.get("href") or "") else None
+			if match: self.fields["releaseYear"] = int(match.group(0))
+		if self.inside("translators"):
+			if "data-translator_id" in attrs and not self.inside("translator"):
+				self.enter(tag, "translator", text=True, once=False, data={
+					"id": int(attrs["data-translator_id"]),
+					"premium": "b-prem_translator" in classes,
+					"lang": None
+				})
+			elif tag == "img" and self.inside("translator"):
+				item = next(r for r in self.regions if r.name == "translator")
+				if item.data["lang"] is None: item.data["lang"] = attrs.get("title")
+
+	def handle_endtag(self, tag):
+		for region in list(self.regions):
+			if region.tag != tag: continue
+			region.depth -= 1
+			if region.depth == 0:
+				self.regions.remove(region)
+				self.leave(region)
+
+	def handle_data(self, data):
+		for region in self.regions:
+			if region.text is not None: region.text.append(data)
+
+	def leave(self, region):
+		text = "".join(region.text) if region.text is not None else None
+		if region.name == "title":
+			self.fields["title"] = text
+		elif region.name in ("names", "origNames"):
+			self.fields[region.name] = [s.strip() for s in text.split("/")]
+		elif region.name == "description":
+			self.fields["description"] = text.strip()
+		elif region.name == "rating_num":
+			self.fields["rating"][0] = float(text)
+		elif region.name == "rating_votes":
+			self.fields["rating"][1] = int(text.strip("()"))
+		elif region.name == "translator":
+			name = text.strip()
+			lang = region.data["lang"]
+			if lang and not lang in name:
+				name += f" ({lang})"
+			self.translators[region.data["id"]] = {"name": name, "premium": region.data["premium"]}
+
+	def result(self):
+		fields = dict(self.fields)
+		post_id = self.ids.get("post_id") or self.ids.get("send-video-issue") or self.ids.get("user-favorites-holder")
+		if post_id: fields["id"] = int(post_id)
+		if self.translators: fields["translators"] = self.translators
+		if "rating" in fields and None in fields["rating"]: del fields["rating"]
+		if "rating" not in self.seen and "title" in fields: fields["rating"] = None
+		if "origNames" not in self.seen and "title" in fields: fields["origNames"] = []
+		if "releaseYear" not in fields and "title" in fields: fields["releaseYear"] = None
+		return fields
+
+
+def extract_title_fields(markup):
+	"""Parse title page fields without building a tree; fields that were not found are left out"""
+	if isinstance(markup, bytes): markup = markup.decode("utf-8", errors="replace")
+	parser = TitlePageParser()
+	try:
+		parser.feed(markup)
+		parser.close()
+	except Exception:
+		return {}
+	return parser.result()
@@ -0,0 +1,17 @@
+import importlib.util
+from functools import lru_cache
+from bs4 import BeautifulSoup
+
+# BeautifulSoup tree builders, fastest first
+parser_backends = ("lxml", "html.parser", "html5lib")
+
+
+def available_parsers():
+	return [name for name in parser_backends if name == "html.parser" or importlib.util.find_spec(name)]
+
+@lru_cache(maxsize=None)
+def default_parser():
+	return available_parsers()[0]
+
+def make_soup(markup, parser=None, cls=BeautifulSoup):
+	return cls(markup, parser or default_parser())
@@ -0,0 +1,153 @@
+import re
+import threading
+import time
+from urllib.parse import urlparse
+from .errors import RateLimited
+
+
+# the site's soft block: a 200 whose get_cdn_series payload has no stream (see IP_BLOCKING_ISSUE.md)
+_success_true = re.compile(rb'"success"\s*:\s*true')
+_url_false = re.compile(rb'"url"\s*:\s*false')
+
+def _origin(url):
+	uri = urlparse(url)
+	return f"{uri.scheme}://{uri.netloc}"
+
+
+def upstream_url(url, kwargs):
+	"""The site URL a request is for; the Cloudflare worker carries it in its JSON payload"""
+	payload = kwargs.get("json")
+	if isinstance(payload, dict) and isinstance(payload.get("url"), str) and payload["url"].startswith("http"):
+		return payload["url"]
+	return url
+
+
+def limit_key(url, kwargs):
+	"""(upstream origin, egress origin): requests relayed by the Cloudflare worker get a bucket of their own"""
+	return (_origin(upstream_url(url, kwargs)), _origin(url))
+
+
+def is_throttled(response, status_forcelist=(429, 503)):
+	"""True for responses that mean "slow down": 429/503 and the `success: true, url: false` soft block"""
+	if response.status_code in status_forcelist: return True
+	if response.status_code != 200: return False
+	body = response.content or b""
+	if len(body) > 4096 or not body.lstrip().startswith(b"{"): return False
+	return bool(_url_false.search(body)) and bool(_success_true.search(body))
+
+
+def retry_after(response):
+	value = response.headers.get("Retry-After", "")
+	return float(value) if value.replace(".", "", 1).isdigit() else 0
+
+
+class TokenBucket:
+	"""Token bucket whose rate follows AIMD: halved on throttling, grown by ~`increase` req/s per second of success"""
+	def __init__(self, rate=4.0, burst=8, min_rate=0.25, max_rate=16.0, increase=0.5, decrease=0.5, quiet=1.0):
+		self.rate = rate
+		self.burst = burst
+		self.min_rate = min_rate
+		self.max_rate = max_rate
+		self.increase = increase
+		self.decrease = decrease
+		self.quiet = quiet # throttles closer than this to the last decrease are one event
+		self.tokens = float(burst)
+		self.updated = time.monotonic()
+		self.blocked_until = 0.0
+		self.last_decrease = float("-inf")
+		self.metrics = {"requests": 0, "rejected": 0, "throttled": 0, "decreases": 0, "waited": 0.0}
+		self._lock = threading.Lock()
+
+	def __repr__(self): return f"<TokenBucket({self.rate:.2f}/s) {self.metrics}>"
+
+	def _refill(self, now):
+		self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+		self.updated = now
+
+	def reserve(self, max_wait=None):
+		"""Take a token; returns the seconds the caller has to wait before sending, or raises RateLimited past `max_wait`"""
+		with self._lock:
+			now = time.monotonic()
+			self._refill(now)
+			delay = max((1 - self.tokens) / self.rate, self.blocked_until - now, 0)
+			if max_wait is not None and delay > max_wait:
+				self.metrics["rejected"] += 1
+				raise RateLimited(delay)
+			self.tokens -= 1
+			self.metrics["requests"] += 1
+			self.metrics["waited"] += delay
+			return delay
+
+	def success(self):
+		with self._lock:
+			self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+	def throttled(self, pause=0):
+		with self._lock:
+			now = time.monotonic()
+			self.metrics["throttled"] += 1
+			if pause: self.blocked_until = max(self.blocked_until, now + pause)
+			if now - self.last_decrease < self.quiet: return
+			self._refill(now)
+			self.rate = max(self.min_rate, self.rate * self.decrease)
+			self.tokens = min(self.tokens, 0)
+			self.last_decrease = now
+			self.metrics["decreases"] += 1
+
+
+class RateLimiter:
+	"""
+	TokenBuckets per (origin, egress route), created on first use with the limiter's settings.
+	Only requests to `paths` are limited (None for all): by default the get_cdn_series calls the
+	site throttles. A caller that would queue longer than `max_wait` seconds gets RateLimited.
+	"""
+	def __init__(self, max_wait=10.0, paths=("/ajax/get_cdn_series/",), **bucket_options):
+		self.max_wait = max_wait
+		self.paths = paths
+		self.bucket_options = bucket_options
+		self.buckets = {}
+		self._lock = threading.Lock()
+
+	def __repr__(self): return f"<RateLimiter {self.snapshot()}>"
+
+	def bucket(self, key):
+		with self._lock:
+			bucket = self.buckets.get(key)
+			if bucket is None: bucket = self.buckets[key] = TokenBucket(**self.bucket_options)
+			return bucket
+
+	def covers(self, url, kwargs):
+		return self.paths is None or urlparse(upstream_url(url, kwargs)).path.startswith(tuple(self.paths))
+
+	def reserve(self, url, kwargs):
+		"""(bucket, seconds to wait) for a request about to be sent; (None, 0) when it is not limited"""
+		if not self.covers(url, kwargs): return None, 0
+		bucket = self.bucket(limit_key(url, kwargs))
+		return bucket, bucket.reserve(self.max_wait)
+
+	def acquire(self, url, kwargs):
+		bucket, delay = self.reserve(url, kwargs)
+		if delay: time.sleep(delay)
+		return bucket
+
+	@staticmethod
+	def feedback(bucket, response):
+		if bucket is None: return
+		if is_throttled(response): bucket.throttled(retry_after(response))
+		elif response.status_code < 400: bucket.success()
+
+	def snapshot(self):
+		with self._lock:
+			return {key: {"rate": round(b.rate, 3), **b.metrics} for key, b in self.buckets.items()}
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+def default_limiter():
+	"""Process-wide limiter: every client in the process shares the egress it protects"""
+	global _default_limiter
+	with _default_limiter_lock:
+		if _default_limiter is None:
+			_default_limiter = RateLimiter()
+		return _default_limiter
@@ -0,0 +1,119 @@
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class FixtureStore:
+	"""Directory of recorded responses, one JSON file per distinct request"""
+	def __init__(self, path):
+		self.path = path
+		os.makedirs(path, exist_ok=True)
+
+	@staticmethod
+	def describe(method, url, params=None, data=None, json=None, **kwargs):
+		# Cloudflare Worker calls wrap the upstream request; store them as that request
+		if isinstance(json, dict) and "url" in json and "data" in json:
+			url, data = json["url"], json["data"]
+		uri = urlparse(url)
+		return {
+			"method": method.upper(),
+			"path": uri.path or "/",
+			"params": {str(k): str(v) for k, v in sorted((params or {}).items())},
+			"data": {str(k): str(v) for k, v in sorted((data or {}).items())},
+		}
+
+	@classmethod
+	def key(cls, method, url, **kwargs):
+		request = cls.describe(method, url, **kwargs)
+		return hashlib.sha1(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+	def filename(self, key):
+		return os.path.join(self.path, f"{key}.json")
+
+	def save(self, method, url, response, **kwargs):
+		entry = {
+			"request": self.describe(method, url, **kwargs),
+			"url": response.url or url,
+			"status": response.status_code,
+			"reason": response.reason,
+			"headers": {k: v for k, v in response.headers.items() if k.lower() not in ("content-encoding", "transfer-encoding", "content-length")},
+			"body": base64.b64encode(response.content).decode("ascii"),
+		}
+		with open(self.filename(self.key(method, url, **kwargs)), "w", encoding="utf-8") as f:
+			json.dump(entry, f, ensure_ascii=False, indent=1)
+
+	def load(self, method, url, **kwargs):
+		try:
+			with open(self.filename(self.key(method, url, **kwargs)), encoding="utf-8") as f:
+				return json.load(f)
+		except FileNotFoundError:
+			return None
+
+	def entries(self):
+		for name in sorted(os.listdir(self.path)):
+			if name.endswith(".json"):
+				with open(os.path.join(self.path, name), encoding="utf-8") as f:
+					yield json.load(f)
+
+	@staticmethod
+	def body(entry):
+		return base64.b64decode(entry["body"])
+
+	@classmethod
+	def response(cls, entry):
+		r = requests.Response()
+		r.status_code = entry["status"]
+		r.reason = entry["reason"]
+		r.url = entry["url"]
+		r.headers = CaseInsensitiveDict(entry["headers"])
+		r._content = cls.body(entry)
+		r.encoding = requests.utils.get_encoding_from_headers(r.headers) or "utf-8"
+		return r
+
+
+class RecordingTransport:
+	"""Passes requests to `transport` and writes every response into `store`"""
+	def __init__(self, transport, store):
+		self.transport = transport
+		self.store = store
+
+	def request(self, method, url, **kwargs):
+		response = self.transport.request(method, url, **kwargs)
+		self.store.save(method, url, response, **kwargs)
+		return response
+
+	def get(self, url, **kwargs): return self.request("GET", url, **kwargs)
+	def post(self, url, **kwargs): return self.request("POST", url, **kwargs)
+	def close(self): self.transport.close()
+
+
+class ReplayTransport:
+	"""Serves recorded responses without touching the network, optionally with simulated latency"""
+	def __init__(self, store, latency=0, jitter=0, seed=None):
+		self.store = store
+		self.latency = latency
+		self.jitter = jitter
+		self.calls = 0
+		self._random = random.Random(seed)
+		self._lock = threading.Lock()
+
+	def request(self, method, url, **kwargs):
+		with self._lock:
+			self.calls += 1
+			delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+		entry = self.store.load(method, url, **kwargs)
+		if entry is None:
+			raise LookupError(f"No recorded response for {method} {url}")
+		if delay: time.sleep(delay)
+		return self.store.response(entry)
+
+	def get(self, url, **kwargs): return self.request("GET", url, **kwargs)
+	def post(self, url, **kwargs): return self.request("POST", url, **kwargs)
+	def close(self): pass
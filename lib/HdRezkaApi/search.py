@@ -1,48 +1,85 @@
-import requests
-from bs4 import BeautifulSoup
 from functools import lru_cache, cached_property
 from urllib.parse import urlparse
 from .types import default_cookies, default_headers
+from .transport import default_transport
+from .cache import default_search_cache, default_search_pages_cache
+from .parsers import make_soup
 from .types import (HdRezkaCategory, Film, Series, Cartoon, Anime)
 from .errors import HTTP, LoginRequiredError, CaptchaError
 
 
+# lowercase letters that look the same in Latin and Cyrillic
+_latin = "aeopcyxkmthbi"
+_cyrillic = "аеорсухкмтнві"
+_to_cyrillic = str.maketrans(_latin, _cyrillic)
+_to_latin = str.maketrans(_cyrillic, _latin)
+
+def normalize_query(query):
+	"""Case-folded, single-spaced query; words mixing Latin and Cyrillic lookalikes are folded into their main script"""
+	words = []
+	for word in str(query).casefold().split():
+		cyrillic = sum(1 for ch in word if "а" <= ch <= "я" or ch in "ёіїєў")
+		latin = sum(1 for ch in word if "a" <= ch <= "z")
+		if cyrillic and latin:
+			word = word.translate(_to_cyrillic if cyrillic >= latin else _to_latin)
+		words.append(word)
+	return " ".join(words)
+
+
 class HdRezkaSearch:
-	def __init__(self, origin, proxy={}, headers={}, cookies={}):
+	def __init__(self, origin, proxy={}, headers={}, cookies={}, transport=None, parser=None, cache=None, pages_cache=None):
 		uri = urlparse(origin)
 		self.origin = f'{uri.scheme}://{uri.netloc}'
 		self.proxy = proxy
 		self.cookies = {**default_cookies, **cookies}
 		self.HEADERS = {**default_headers, **headers}
+		self.transport = transport or default_transport()
+		self.parser = parser
+		if cache is None: cache = default_search_cache
+		self.cache = cache if cache is not False else None
+		if pages_cache is None and cache is False: pages_cache = False # cache=False disables the /search/ pages cache too
+		self.pages_cache = pages_cache
 
 	def __call__(self, query, find_all=False):
 		return self.advanced_search(query) if find_all else self.fast_search(query)
 
 	def fast_search(self, query):
-		r = requests.post(f'{self.origin}/engine/ajax/search.php', data={'q': query}, headers=self.HEADERS, proxies=self.proxy, cookies=self.cookies)
-		if r.ok:
-			soup = BeautifulSoup(r.content, 'html.parser')
-			results = []
-			for item in soup.select('.b-search__section_list li'):
-				title = item.find('span', class_='enty').get_text().strip()
-				url = item.find('a').attrs['href']
-				rating_span = item.find('span', class_='rating')
-				rating = float(rating_span.get_text()) if rating_span else None
-				results.append({"title": title, "url": url, "rating": rating})
-			return results
+		query = normalize_query(query)
+		if self.cache is None: return self._fast_search(query)
+		return list(self.cache.get_or_load(("fast", self.origin, query), lambda: self._fast_search(query)))
+
+	def _fast_search(self, query):
+		r = self.transport.post(f'{self.origin}/engine/ajax/search.php', data={'q': query}, headers=self.HEADERS, proxies=self.proxy, cookies=self.cookies)
+		if r.ok: return self.parse_fast_search(r.content, self.parser)
 		raise HTTP(r.status_code, r.reason)
 
+	@staticmethod
+	def parse_fast_search(content, parser=None):
+		soup = make_soup(content, parser)
+		results = []
+		for item in soup.select('.b-search__section_list li'):
+			title = item.find('span', class_='enty').get_text().strip()
+			url = item.find('a').attrs['href']
+			rating_span = item.find('span', class_='rating')
+			rating = float(rating_span.get_text()) if rating_span else None
+			results.append({"title": title, "url": url, "rating": rating})
+		return results
+
 	def advanced_search(self, query):
-		return SearchResult(self.origin, query, proxy=self.proxy, cookies=self.cookies, headers=self.HEADERS)
+		return SearchResult(self.origin, query, proxy=self.proxy, cookies=self.cookies, headers=self.HEADERS, transport=self.transport, parser=self.parser, cache=self.pages_cache)
 
 
 class SearchResult:
-	def __init__(self, origin, query, proxy=None, headers=None, cookies=None):
+	def __init__(self, origin, query, proxy=None, headers=None, cookies=None, transport=None, parser=None, cache=None):
 		self.origin = origin
-		self.query = query
+		self.query = normalize_query(query)
 		self.proxy = proxy
 		self.headers = headers
 		self.cookies = cookies
+		self.transport = transport or default_transport()
+		self.parser = parser
+		if cache is None: cache = default_search_pages_cache
+		self.cache = cache if cache is not False else None
 	def __str__(self): return f"SearchResult({self.query})"
 	def __len__(self): return len(self.all_pages)
 
@@ -68,19 +105,26 @@ class SearchResult:
 
 	@lru_cache(maxsize=None)
 	def get_page(self, page):
+		if self.cache is None: return self._get_page(page)
+		return self.cache.get_or_load(("page", self.origin, self.query, page), lambda: self._get_page(page))
+
+	def _get_page(self, page):
 		data = {
 			'do': 'search',
 			'subaction': 'search',
 			'q': self.query,
 			'page': page
 		}
-		r = requests.get(f'{self.origin}/search/', params=data, headers=self.headers, proxies=self.proxy, cookies=self.cookies)
-		if r.ok:
-			soup = BeautifulSoup(r.content, 'html.parser')
-			if soup.title.text == "Sign In": raise LoginRequiredError()
-			if soup.title.text == "Verify": raise CaptchaError()
-			items = soup.find_all(class_='b-content__inline_item')
-			if len(items) > 0: return list(map(self.process_item, items))
+		r = self.transport.get(f'{self.origin}/search/', params=data, headers=self.headers, proxies=self.proxy, cookies=self.cookies)
+		if r.ok: return self.parse_page(r.content, self.parser)
+
+	@classmethod
+	def parse_page(cls, content, parser=None):
+		soup = make_soup(content, parser)
+		if soup.title.text == "Sign In": raise LoginRequiredError()
+		if soup.title.text == "Verify": raise CaptchaError()
+		items = soup.find_all(class_='b-content__inline_item')
+		if len(items) > 0: return list(map(cls.process_item, items))
 
 	@classmethod
 	def process_item(cls, item):
@@ -89,9 +133,10 @@ class SearchResult:
 		url = link.attrs['href']
 		title = link.text.strip()
 		image = cover.attrs['src']
+		info = item.find(class_='b-content__inline_item-link').find('div')
 		cat = item.find(class_='cat')
 		type_ = cls.detect_type(list(filter(lambda x:x!='cat',cat['class']))) if cat else None
-		return {"title": title, "url": url, "image": image, "category": type_}
+		return {"title": title, "url": url, "image": image, "category": type_, "info": info.text.strip() if info else ""}
 
 	@staticmethod
 	def detect_type(classes):
@@ -1,13 +1,15 @@
 from urllib.parse import urlparse
 from .api import HdRezkaApi
 from .search import HdRezkaSearch
+from .transport import HdRezkaTransport
 from .types import default_cookies, default_headers
 from .types import default_translators_priority, default_translators_non_priority
 
 
 class HdRezkaSession:
 	def __init__(self, origin="", proxy={}, headers={}, cookies={},
-		translators_priority=None, translators_non_priority=None
+		translators_priority=None, translators_non_priority=None,
+		transport=None, pool_maxsize=10, retries=3, parser=None
 	):
 		self.origin = None
 		if origin:
@@ -18,9 +20,15 @@ class HdRezkaSession:
 		self.HEADERS = {**default_headers, **headers}
 		self._translators_priority = translators_priority or default_translators_priority
 		self._translators_non_priority = translators_non_priority or default_translators_non_priority
+		self._own_transport = transport is None
+		self.transport = transport or HdRezkaTransport(pool_maxsize=pool_maxsize, retries=retries)
+		self.parser = parser
 
 	def __enter__(self): return self
-	def __exit__(self, type, value, traceback): pass
+	def __exit__(self, type, value, traceback): self.close()
+
+	def close(self):
+		if self._own_transport: self.transport.close()
 
 	@property
 	def translators_priority(self):
@@ -40,7 +48,7 @@ class HdRezkaSession:
 
 	def login(self, email:str, password:str, **kwargs):
 		if not self.origin: raise ValueError("For login origin is required")
-		rezka = HdRezkaApi(self.origin,headers=self.HEADERS,proxy=self.proxy)
+		rezka = HdRezkaApi(self.origin,headers=self.HEADERS,proxy=self.proxy,transport=self.transport,parser=self.parser)
 		if rezka.login(email=email, password=password, **kwargs):
 			self.cookies = {**self.cookies,**rezka.cookies}
 			return True
@@ -55,6 +63,8 @@ class HdRezkaSession:
 			"cookies": self.cookies,
 			"translators_priority": self._translators_priority,
 			"translators_non_priority": self._translators_non_priority,
+			"transport": self.transport,
+			"parser": self.parser,
 			**kwargs
 		})
 		if rezka.ok: return rezka
@@ -62,4 +72,4 @@ class HdRezkaSession:
 
 	def search(self, query, find_all=False):
 		if not self.origin: raise ValueError("For search origin is required")
-		return HdRezkaSearch(self.origin,proxy=self.proxy,headers=self.HEADERS,cookies=self.cookies)(query, find_all=find_all)
+		return HdRezkaSearch(self.origin,proxy=self.proxy,headers=self.HEADERS,cookies=self.cookies,transport=self.transport,parser=self.parser)(query, find_all=find_all)
@@ -1,49 +1,115 @@
+import re
+
+# "[720p]url or url,[1080p]url" -> ("720p", "url or url"), ("1080p", "url")
+_segment = re.compile(r'\[([^\]]*)\]([^,]*)')
+_height = re.compile(r'\d+')
+_named_heights = {"2K": 1440, "4K": 2160}
+
+def quality_key(resolution):
+	height = _named_heights.get(resolution)
+	if height is None:
+		match = _height.search(resolution)
+		height = int(match.group(0)) if match else 0
+	return (height, resolution)
+
+
 class HdRezkaStream():
+	__slots__ = ("_videos", "_index", "season", "episode", "name", "translator_id", "subtitles")
+
 	def __init__(self, season, episode, name, translator_id, subtitles={}):
 		self._videos = {}
+		self._index = {}
 		self.season = season
 		self.episode = episode
 		self.name = name
 		self.translator_id = translator_id
-		self.subtitles = HdRezkaStreamSubtitles(**subtitles)
-	
+		if isinstance(subtitles, HdRezkaStreamSubtitles): self.subtitles = subtitles
+		else: self.subtitles = HdRezkaStreamSubtitles(**subtitles)
+
+	@classmethod
+	def parse(cls, data, season, episode, name, translator_id, subtitles={}):
+		"""Build a stream from a decoded `[quality]url or url,...` string"""
+		stream = cls(season, episode, name, translator_id, subtitles)
+		videos = {}
+		for quality, links in _segment.findall(data):
+			links = [link for link in links.split(" or ") if link.endswith(".mp4")]
+			if links: videos.setdefault(quality, []).extend(links)
+		stream._set_videos(videos)
+		return stream
+
 	@property
 	def videos(self): return self._videos
 
+	def _set_videos(self, videos):
+		self._videos = dict(sorted(videos.items(), key=lambda item: quality_key(item[0])))
+		self._index = {}
+		for resolution in self._videos:
+			self._index.setdefault(resolution, resolution)
+			match = _height.search(resolution)
+			if match: self._index.setdefault(match.group(0), resolution)
+
 	def append(self, resolution, link):
 		if resolution in self._videos.keys():
 			self._videos[resolution].append(link)
 		else:
-			self._videos[resolution] = [link]
+			self._set_videos({**self._videos, resolution: [link]})
 
 	def __call__(self, resolution):
-		coincidences = list(filter(lambda x: str(resolution) in x , self._videos))
-		if len(coincidences) > 0:
-			return self._videos[coincidences[0]]
+		key = self._index.get(str(resolution))
+		if key is None:
+			key = next((x for x in self._videos if str(resolution) in x), None)
+		if key is not None:
+			return self._videos[key]
 		raise ValueError(f'Resolution "{resolution}" is not defined')
 
+	def to_dict(self):
+		return {
+			"season": self.season,
+			"episode": self.episode,
+			"name": self.name,
+			"translator_id": self.translator_id,
+			"videos": {resolution: list(links) for resolution, links in self._videos.items()},
+			"subtitles": self.subtitles.to_dict()
+		}
+
+	@classmethod
+	def from_dict(cls, data):
+		stream = cls(data["season"], data["episode"], data["name"], data["translator_id"],
+			HdRezkaStreamSubtitles.from_dict(data.get("subtitles") or {}))
+		stream._set_videos({resolution: list(links) for resolution, links in data["videos"].items()})
+		return stream
+
 	def __str__(self):
 		resolutions = list(self._videos.keys())
 		if self.subtitles.subtitles:
 			return f"<HdRezkaStream> : {resolutions}, subtitles={self.subtitles}"
 		return "<HdRezkaStream> : " + str(resolutions)
-	
+
 	def __repr__(self):
 		return f"<HdRezkaStream(season:{self.season}, episode:{self.episode})>"
 
 class HdRezkaStreamSubtitles():
-	def __init__(self, data, codes):
+	__slots__ = ("subtitles", "keys")
+
+	def __init__(self, data=None, codes=None):
 		self.subtitles = {}
 		self.keys = []
 		if data:
-			arr = data.split(",")
-			for i in arr:
-				temp = i.split("[")[1].split("]")
-				lang = temp[0]
-				link = temp[1]
+			for lang, link in _segment.findall(data):
 				code = codes[lang]
 				self.subtitles[code] = {'title': lang, 'link': link}
 			self.keys = list(self.subtitles.keys())
+
+	def to_dict(self):
+		return {code: dict(value) for code, value in self.subtitles.items()}
+
+	@classmethod
+	def from_dict(cls, data):
+		subtitles = cls()
+		subtitles.subtitles = {code: dict(value) for code, value in data.items()}
+		subtitles.keys = list(subtitles.subtitles.keys())
+		return subtitles
+
 	def __str__(self):
 		return str(self.keys)
 	def __repr__(self):
@@ -0,0 +1,68 @@
+from functools import lru_cache
+from .search import normalize_query
+
+
+@lru_cache(maxsize=64)
+def priority_ranks(priority=(), non_priority=()):
+	"""(id -> rank, rank of unlisted ids) in the order sort_translators uses"""
+	rank = {item: index + 1 for index, item in enumerate(priority)}
+	max_index = len(rank) + 1
+	for index, item in enumerate(non_priority):
+		rank.setdefault(item, max_index + index + 1)
+	return rank, max_index
+
+
+class TranslatorIndex:
+	"""Translators of one title: id -> info, normalized name -> id and priority ranks, built once"""
+	__slots__ = ("info", "ids", "by_name", "priority", "non_priority")
+
+	def __init__(self, translators, priority=(), non_priority=()):
+		self.info = translators # id -> {"name", "premium"}
+		self.ids = list(translators)
+		self.by_name = {}
+		for tr_id, info in translators.items():
+			self.by_name.setdefault(info["name"], tr_id)
+			self.by_name.setdefault(normalize_query(info["name"]), tr_id)
+		self.priority = tuple(priority or ())
+		self.non_priority = tuple(non_priority or ())
+		priority_ranks(self.priority, self.non_priority)
+
+	def __contains__(self, tr_id): return tr_id in self.info
+	def __len__(self): return len(self.info)
+
+	def resolve(self, translation):
+		"""Translator id for an id or a name, or None"""
+		if str(translation).isnumeric():
+			return int(translation) if int(translation) in self.info else None
+		tr_id = self.by_name.get(translation)
+		return tr_id if tr_id is not None else self.by_name.get(normalize_query(translation))
+
+	def require(self, translation, available=None):
+		"""resolve(), raising ValueError when the translator is unknown or not among `available`"""
+		tr_id = self.resolve(translation)
+		if tr_id is None or (available is not None and tr_id not in available):
+			if str(translation).isnumeric():
+				raise ValueError(f'Translation with code "{translation}" is not defined')
+			raise ValueError(f'Translation "{translation}" is not defined')
+		return tr_id
+
+	def ranks(self, priority=None, non_priority=None):
+		"""(id -> rank, default rank); explicit lists override the title's ones like in sort_translators"""
+		return priority_ranks(
+			tuple(priority) if isinstance(priority, list) else self.priority,
+			tuple(non_priority) if isinstance(non_priority, list) else self.non_priority
+		)
+
+	def sort(self, translators, priority=None, non_priority=None):
+		rank, default = self.ranks(priority, non_priority)
+		return dict(sorted(translators.items(), key=lambda item: rank.get(item[0], default)))
+
+	def best(self, candidates=None, priority=None, non_priority=None):
+		"""Highest-ranked translator id of `candidates` (all by default); ties keep their order"""
+		rank, default = self.ranks(priority, non_priority)
+		best, best_rank = None, None
+		for tr_id in (self.ids if candidates is None else candidates):
+			r = rank.get(tr_id, default)
+			if best_rank is None or r < best_rank:
+				best, best_rank = tr_id, r
+		return best
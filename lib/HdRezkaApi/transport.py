@@ -0,0 +1,130 @@
+import random
+import requests
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .ratelimit import default_limiter
+
+
+def _items(mapping):
+	if not mapping: return ()
+	if isinstance(mapping, (str, bytes)): return mapping
+	return tuple(sorted((str(k), str(v)) for k, v in dict(mapping).items()))
+
+
+def coalesce_key(method, url, kwargs):
+	"""Identity of a request that concurrent callers can share: page GETs and get_cdn_series POSTs, else None"""
+	cookies = _items(kwargs.get("cookies"))
+	if method.upper() == "GET":
+		return ("GET", url, _items(kwargs.get("params")), cookies)
+	if method.upper() != "POST": return None
+	payload = kwargs.get("json")
+	if isinstance(payload, dict) and str(payload.get("url", "")).endswith("/ajax/get_cdn_series/"):
+		# Cloudflare worker: the upstream request is wrapped in the json body
+		return ("POST", payload["url"], _items(payload.get("data")), cookies)
+	if url.endswith("/ajax/get_cdn_series/"):
+		return ("POST", url, _items(kwargs.get("data")), cookies)
+	return None
+
+
+class _Call:
+	__slots__ = ("done", "response", "error")
+	def __init__(self):
+		self.done = threading.Event()
+		self.response = None
+		self.error = None
+
+
+class HdRezkaTransport:
+	"""Keep-alive HTTP transport shared by every request of the library"""
+	def __init__(self, pool_connections=10, pool_maxsize=10, retries=3,
+		backoff_factor=0.3, status_forcelist=(500, 502, 504), timeout=None,
+		coalesce=True, rate_limit=None
+	):
+		self.timeout = timeout
+		# token buckets per (origin, egress route); None shares the process-wide limiter, False disables
+		if rate_limit is None: rate_limit = default_limiter()
+		self.rate_limit = rate_limit or None
+		# single-flight: identical concurrent requests wait for one upstream call and share its response
+		self.coalesce = coalesce
+		self.coalesced = 0
+		self._inflight = {}
+		self._inflight_lock = threading.Lock()
+		self.session = requests.Session()
+		# cookies are always passed per call, never shared between users of the pool
+		self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+		adapter = HTTPAdapter(
+			pool_connections=pool_connections,
+			pool_maxsize=pool_maxsize,
+			max_retries=Retry(
+				total=retries,
+				backoff_factor=backoff_factor,
+				status_forcelist=status_forcelist,
+				raise_on_status=False
+			)
+		)
+		self.session.mount("http://", adapter)
+		self.session.mount("https://", adapter)
+
+	def __enter__(self): return self
+	def __exit__(self, type, value, traceback): self.close()
+
+	def request(self, method, url, **kwargs):
+		kwargs.setdefault("timeout", self.timeout)
+		key = coalesce_key(method, url, kwargs) if self.coalesce else None
+		if key is None: return self._send(method, url, **kwargs)
+
+		with self._inflight_lock:
+			call = self._inflight.get(key)
+			leader = call is None
+			if leader: call = self._inflight[key] = _Call()
+			else: self.coalesced += 1
+		if not leader:
+			call.done.wait()
+			if call.error is not None: raise call.error
+			return call.response
+
+		try:
+			call.response = self._send(method, url, **kwargs)
+			return call.response
+		except BaseException as e:
+			call.error = e
+			raise
+		finally:
+			with self._inflight_lock:
+				del self._inflight[key]
+			call.done.set()
+
+	def _send(self, method, url, **kwargs):
+		if self.rate_limit is None: return self.session.request(method, url, **kwargs)
+		bucket = self.rate_limit.acquire(url, kwargs)
+		response = self.session.request(method, url, **kwargs)
+		self.rate_limit.feedback(bucket, response)
+		return response
+
+	def get(self, url, **kwargs):
+		return self.request("GET", url, **kwargs)
+
+	def post(self, url, **kwargs):
+		return self.request("POST", url, **kwargs)
+
+	def close(self):
+		self.session.close()
+
+
+def backoff_delay(attempt, base=0.5, cap=30):
+	"""Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]"""
+	return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+def default_transport():
+	"""Process-wide transport used when none is injected"""
+	global _default_transport
+	with _default_transport_lock:
+		if _default_transport is None:
+			_default_transport = HdRezkaTransport()
+		return _default_transport
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+BrowserPool regression tests against an in-memory stand-in for Playwright (no Chromium needed)
+"""
+import asyncio
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    async def close(self):
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        return FakeContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+
+    async def launch(self, **options):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+def install_fake_playwright():
+    """Route `playwright.async_api` to the fakes; returns the fake driver"""
+    driver = FakePlaywright()
+    api = types.ModuleType('playwright.async_api')
+    api.async_playwright = lambda: driver
+    api.TimeoutError = type('TimeoutError', (Exception,), {})
+    sys.modules['playwright'] = types.ModuleType('playwright')
+    sys.modules['playwright.async_api'] = api
+    sys.modules.pop('app.utils', None)
+    return driver
+
+
+async def open_page(page):
+    return 'ok'
+
+
+def test_idle_browser_past_max_age_is_recycled():
+    driver = install_fake_playwright()
+    from app.utils import BrowserPool
+
+    pool = BrowserPool(browsers=1, max_age=0.5)
+    try:
+        assert pool.run(open_page, timeout=5) == 'ok'
+        time.sleep(1)  # the only browser wears out while idle
+        assert pool.run(open_page, timeout=5) == 'ok'
+        assert len(driver.chromium.launched) == 2
+        assert not driver.chromium.launched[0].connected
+        assert pool.stats['recycled'] == 1
+    finally:
+        pool.close()
+
+
+def test_worn_out_browser_is_recycled_after_its_last_page():
+    driver = install_fake_playwright()
+    from app.utils import BrowserPool
+
+    pool = BrowserPool(browsers=1, max_pages=2, browser_uses=3)
+    try:
+        for _ in range(7):
+            assert pool.run(open_page, timeout=5) == 'ok'
+        assert len(driver.chromium.launched) == 3
+        assert pool.stats['pages'] == 7
+    finally:
+        pool.close()
+
+
+if __name__ == '__main__':
+    test_idle_browser_past_max_age_is_recycled()
+    test_worn_out_browser_is_recycled_after_its_last_page()
+    print("✓ BrowserPool tests passed")
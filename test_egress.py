@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+EgressRouter tests: circuit breaker, half-open probe and demotion, with routes backed by plain functions
+"""
+import asyncio
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib'))
+
+from HdRezkaApi.egress import CallableRoute, EgressRouter
+from HdRezkaApi.errors import RateLimited
+from HdRezkaApi.aio import AsyncHdRezkaApi
+
+STREAM = {'action': 'get_stream', 'id': 1, 'translator_id': 56, 'season': 1, 'episode': 1}
+EPISODES = {'action': 'get_episodes', 'id': 1, 'translator_id': 56}
+OK = {'success': True, 'url': '[720p]https://cdn/a.mp4'}
+
+
+class FakeUpstream:
+    """Route function whose next outcomes are scripted; 'ok', 'fail' or 'slow'"""
+
+    def __init__(self, *outcomes, default='ok'):
+        self.outcomes = list(outcomes)
+        self.default = default
+        self.calls = 0
+
+    def __call__(self, rezka, data, timeout=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else self.default
+        if outcome == 'slow':
+            time.sleep(0.3)
+        if outcome == 'fail':
+            raise ConnectionError('upstream down')
+        return OK
+
+
+def make_router(direct, worker=None, **options):
+    routes = [CallableRoute('direct', direct, cost=0, actions=None)]
+    if worker is not None:
+        routes.append(CallableRoute('worker', worker, cost=1, actions=None))
+    return EgressRouter(routes, **options)
+
+
+def health(router, name, data=STREAM):
+    return router.health[(name, 'stream' if data is STREAM else 'other')]
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_once():
+    direct = FakeUpstream('fail', 'fail', 'fail')
+    router = make_router(direct, failure_threshold=3, cooldown=0.2)
+    for _ in range(3):
+        try:
+            router.call(None, STREAM)
+        except ConnectionError:
+            pass
+    assert health(router, 'direct').state == 'open'
+    assert router.plan(STREAM) == []
+
+    time.sleep(0.25)
+    assert health(router, 'direct').state == 'half-open'
+    route = router.plan(STREAM)[0]
+    assert router.allow(route, STREAM)
+    assert not router.allow(route, STREAM)  # a single trial
+    router.record(route, STREAM, OK)
+    assert health(router, 'direct').state == 'closed'
+    assert router.call(None, STREAM) == OK
+
+
+def test_breaker_is_kept_per_action_class():
+    def direct(rezka, data, timeout=None):
+        if data['action'] == 'get_stream':
+            raise ConnectionError('streams are blocked from this host')
+        return OK
+
+    router = make_router(direct, FakeUpstream(), failure_threshold=3)
+    for _ in range(3):
+        router.call(None, STREAM)  # falls through to the worker
+        router.call(None, EPISODES)
+    assert health(router, 'direct').state == 'open'
+    assert health(router, 'direct', EPISODES).state == 'closed'
+
+
+def test_abandoned_probe_is_given_back():
+    router = make_router(FakeUpstream(), failure_threshold=1, cooldown=0.1)
+    route = router.routes[0]
+    router.record(route, STREAM, error=ConnectionError('down'))
+    time.sleep(0.15)
+
+    dispatch = router.dispatch(STREAM)
+    routes = iter(dispatch)
+    assert next(routes) is route
+    assert health(router, 'direct').trial
+    routes.close()  # the caller went away before reporting an outcome
+    assert not health(router, 'direct').trial
+    assert router.plan(STREAM) == [route]
+
+
+def test_cancelled_async_call_gives_the_probe_back():
+    router = make_router(FakeUpstream('slow'), failure_threshold=1, cooldown=0.1)
+    router.record(router.routes[0], STREAM, error=ConnectionError('down'))
+    time.sleep(0.15)
+    client = types.SimpleNamespace(api=types.SimpleNamespace(egress=router, egress_exclude=(), request_timeout=5))
+
+    async def abandon():
+        task = asyncio.ensure_future(AsyncHdRezkaApi._cdn_series(client, STREAM))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(abandon())
+    assert not health(router, 'direct').trial
+    assert router.call(None, STREAM) == OK
+
+
+def test_single_failure_does_not_demote():
+    direct, worker = FakeUpstream('fail'), FakeUpstream()
+    router = make_router(direct, worker)
+    assert router.call(None, STREAM) == OK  # served by the worker
+    for _ in range(5):
+        router.call(None, STREAM)
+    assert direct.calls == 6
+    assert worker.calls == 1
+
+
+def test_demotion_expires_after_cooldown():
+    direct, worker = FakeUpstream('fail', 'ok', 'fail'), FakeUpstream()
+    router = make_router(direct, worker, cooldown=0.2)
+    for _ in range(5):
+        router.call(None, STREAM)
+    assert health(router, 'direct').state == 'closed'
+    assert direct.calls == 3  # 1/3 successes: the worker goes first
+    assert [r.name for r in router.plan(STREAM)] == ['worker', 'direct']
+
+    time.sleep(0.25)
+    assert [r.name for r in router.plan(STREAM)] == ['direct', 'worker']
+    router.call(None, STREAM)
+    assert direct.calls == 4
+
+
+def test_local_rate_limit_is_not_a_route_failure():
+    def limited(rezka, data, timeout=None):
+        raise RateLimited(30)
+
+    router = make_router(limited, FakeUpstream(), failure_threshold=1)
+    assert router.call(None, STREAM) == OK  # shed to the worker's bucket
+    assert health(router, 'direct').state == 'closed'
+    assert health(router, 'direct').success_rate == 1.0
+
+    router = make_router(limited)
+    try:
+        router.call(None, STREAM)
+        assert False, 'RateLimited expected'
+    except RateLimited:
+        pass
+
+
+if __name__ == '__main__':
+    test_breaker_opens_after_consecutive_failures_and_probes_once()
+    test_breaker_is_kept_per_action_class()
+    test_abandoned_probe_is_given_back()
+    test_cancelled_async_call_gives_the_probe_back()
+    test_single_failure_does_not_demote()
+    test_demotion_expires_after_cooldown()
+    test_local_rate_limit_is_not_a_route_failure()
+    print("✓ EgressRouter tests passed")
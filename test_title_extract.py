@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+extract_title_fields must agree with the BeautifulSoup _parse_* methods it replaced, on the
+synthetic title page and on pages with missing or unusual markup
+"""
+import os
+import re
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'lib'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from HdRezkaApi import HdRezkaApi, LoginRequiredError, CaptchaError
+from HdRezkaApi.extract import extract_title_fields
+import synthetic
+
+PAGE = synthetic.title_page(translators=8)
+
+
+def client(markup):
+    """HdRezkaApi whose page is `markup`; nothing is fetched"""
+    rezka = HdRezkaApi(synthetic.ORIGIN + synthetic.TITLE_PATH, title_cache=False)
+    rezka.__dict__['page'] = types.SimpleNamespace(content=markup.encode('utf-8'), text=markup)
+    return rezka
+
+
+def soup_fields(markup):
+    """Title fields from the BeautifulSoup parsers alone; fields they cannot parse are left out"""
+    rezka = client(markup)
+    fields = {}
+    for field in HdRezkaApi.title_fields:
+        try:
+            fields[field] = getattr(rezka, f'_parse_{field}')()
+        except Exception:
+            pass
+    return fields
+
+
+def extracted(markup):
+    fields = extract_title_fields(markup)
+    return {field: fields[field] for field in HdRezkaApi.title_fields if field in fields}
+
+
+def assert_matches_soup(markup):
+    fast, soup = extracted(markup), soup_fields(markup)
+    for field, value in fast.items():
+        assert value == soup.get(field), f'{field}: {value!r} != soup {soup.get(field)!r}'
+    assert client(markup)._parse_meta() == soup  # the soup fallback fills whatever was left out
+    return fast, soup
+
+
+def test_synthetic_page():
+    fast, soup = assert_matches_soup(PAGE)
+    assert fast == soup
+    assert soup['translators'][62] == {'name': 'Студия 6', 'premium': True}
+    assert soup['translators'][60]['name'] == 'Студия 4 (Украинский)'
+
+
+def test_without_translators_list():
+    markup = re.sub(r'<ul id="translators-list".*?</ul>', '', PAGE, flags=re.S)
+    fast, soup = assert_matches_soup(markup)
+    assert 'translators' not in fast
+    assert soup['translators'] == {56: {'name': 'Студия 0', 'premium': False}}  # from the player init and info table
+
+
+def test_without_rating():
+    markup = re.sub(r'<div class="b-post__rating">.*?</div>', '', PAGE, flags=re.S)
+    fast, soup = assert_matches_soup(markup)
+    assert fast['rating'] is None
+
+
+def test_translator_flag_without_title():
+    markup = PAGE.replace(' title="Украинский" />', ' />')
+    fast, soup = assert_matches_soup(markup)
+    assert fast['translators'][60]['name'] == 'Студия 4'
+
+
+def test_login_and_captcha_pages():
+    for title, error in (('Sign In', LoginRequiredError), ('Verify', CaptchaError)):
+        markup = f'<!DOCTYPE html><html><head><title>{title}</title></head><body></body></html>'
+        assert extract_title_fields(markup)['title'] == title
+        try:
+            client(markup)._parse_meta()
+            assert False, f'{error.__name__} expected'
+        except error:
+            pass
+
+
+if __name__ == '__main__':
+    test_synthetic_page()
+    test_without_translators_list()
+    test_without_rating()
+    test_translator_flag_without_title()
+    test_login_and_captcha_pages()
+    print("✓ Title extraction tests passed")